@@ -0,0 +1,79 @@
+"""
+Shared pytest fixtures for the Media Converter test suite
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the current directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+
+@pytest.fixture(scope="session")
+def img_converter():
+    """One ImageConverter for the whole session (per xdist worker)"""
+    from image_converter import ImageConverter
+    return ImageConverter()
+
+
+@pytest.fixture(scope="session")
+def vid_converter():
+    """One VideoConverter for the whole session (per xdist worker)"""
+    from video_converter import VideoConverter
+    return VideoConverter()
+
+
+@pytest.fixture
+def test_image(tmp_path):
+    """A small red JPEG in the test's own temporary directory"""
+    from PIL import Image
+
+    test_image_path = tmp_path / "test_image.jpg"
+    Image.new('RGB', (100, 100), color='red').save(test_image_path, 'JPEG')
+    return test_image_path
+
+
+class FFmpegRecorder:
+    """Stands in for subprocess.run in video_converter, keeping every command"""
+
+    def __init__(self):
+        self.commands = []
+        self.inputs = []
+        self.returncode = 0
+        self.on_run = None  # Called with each command, e.g. to write the files FFmpeg would
+
+    def __call__(self, cmd, input=None, **kwargs):
+        import subprocess
+
+        self.commands.append(list(cmd))
+        self.inputs.append(input)
+        if self.on_run:
+            self.on_run(cmd)
+        text = kwargs.get('text') or kwargs.get('universal_newlines')
+        stderr = 'stub error' if text else b'stub error'
+        return subprocess.CompletedProcess(cmd, self.returncode, stdout=stderr[:0], stderr=stderr)
+
+
+@pytest.fixture
+def ffmpeg_stub(monkeypatch):
+    """Record FFmpeg commands instead of running them; no hardware encoders"""
+    import video_converter
+
+    recorder = FFmpegRecorder()
+    monkeypatch.setattr(video_converter.subprocess, 'run', recorder)
+    monkeypatch.setattr(video_converter, 'ffmpeg_encoders', frozenset)
+    monkeypatch.setattr(video_converter, 'ffmpeg_hwaccels', frozenset)
+    return recorder
+
+
+@pytest.fixture
+def stub_converter(ffmpeg_stub):
+    """A VideoConverter whose FFmpeg runs are recorded by ffmpeg_stub, without ffprobe"""
+    from video_converter import VideoConverter
+
+    converter = VideoConverter()
+    converter.ffmpeg_path = 'ffmpeg'
+    converter.ffprobe_path = None
+    return converter
@@ -5,23 +5,66 @@ Demonstrates all features with real examples and user interaction
 """
 
 import os
+import queue
+import shutil
+import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Optional
 from PIL import Image, ImageDraw, ImageFont
 
 # Add current directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
 try:
-    from image_converter import ImageConverter
-    from video_converter import VideoConverter
+    from image_converter import ImageConverter, ConversionResult
+    from video_converter import EncodeJob, VideoConverter
     from media_converter import MediaConverterCLI
 except ImportError as e:
     print(f"❌ Import Error: {e}")
     print("Make sure you're running this from the scripts directory")
     sys.exit(1)
 
+# Optional libjpeg-turbo bindings for faster JPEG encoding
+try:
+    import numpy as np
+    from turbojpeg import TurboJPEG, TJPF_RGB
+except ImportError:
+    TurboJPEG = None
+
+# Optional SIMD resizer (fast_image_resize) for the resize demo
+try:
+    from cykooz.resizer import CpuExtensions, FilterType, ResizeAlg, ResizeOptions, Resizer
+    _resizer = Resizer()
+    try:
+        _resizer.cpu_extensions = CpuExtensions.avx2
+    except Exception:
+        pass  # Keep the best extension detected for this CPU
+except ImportError:
+    _resizer = None
+
+
+def _release_pagecache(path: str):
+    """Drop a written file from the OS page cache (Linux only; no-op elsewhere)"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def _encode_one(input_path: str, output_path: str, quality: int) -> ConversionResult:
+    """Re-encode one image in a worker process"""
+    return ImageConverter().convert(input_path, output_path, quality=quality, optimize=True)
+
 
 class MediaConverterDemo:
     """Interactive demonstration of the Media Converter tool"""
@@ -29,7 +72,20 @@ class MediaConverterDemo:
     def __init__(self):
         self.image_converter = ImageConverter()
         self.video_converter = VideoConverter()
-        self.demo_files = []
+        self.demo_files: dict[str, int] = {}  # path -> size in bytes
+        self._lock = threading.Lock()  # Guards demo_files and output from worker threads
+        self._turbojpeg = self._load_turbojpeg()
+
+        self._template_cache: dict[tuple, Image.Image] = {}
+        self._ffmpeg_ok = None
+
+        # Load the default font once; create_demo_image reuses it
+        try:
+            self._font = ImageFont.load_default()
+            self._glyph_w = self._font.getlength('0')
+        except Exception:
+            self._font = None
+            self._glyph_w = 0
 
     def print_header(self, title: str):
         """Print a formatted section header"""
@@ -50,22 +106,150 @@ class MediaConverterDemo:
             self.cleanup()
             sys.exit(0)
 
+    def _load_turbojpeg(self):
+        """Load libjpeg-turbo if PyTurboJPEG and the shared library are available"""
+        if TurboJPEG is None:
+            return None
+        try:
+            return TurboJPEG()
+        except Exception:
+            return None
+
+    def _encode_jpeg(self, img: Image.Image, path: str, quality: int = 95):
+        """Encode a JPEG with libjpeg-turbo when available, falling back to Pillow"""
+        if self._turbojpeg is not None and img.mode == 'RGB':
+            data = self._turbojpeg.encode(np.asarray(img), quality=quality, pixel_format=TJPF_RGB)
+            with open(path, 'wb') as f:
+                f.write(data)
+        else:
+            img.save(path, 'JPEG', quality=quality)
+
+    def _resize_simd(self, input_path: str, output_path: str, scale: float, quality: int = 85) -> ConversionResult:
+        """Resize with cykooz.resizer (Lanczos3) and encode through ImageConverter"""
+        try:
+            with Image.open(input_path) as src:
+                src = src.convert('RGB')
+                dst = Image.new('RGB', (int(src.width * scale), int(src.height * scale)))
+                options = ResizeOptions(resize_alg=ResizeAlg.convolution(FilterType.lanczos3))
+                _resizer.resize_pil(src, dst, options)
+            return self.image_converter.encode_from_image(dst, output_path, quality=quality, optimize=True)
+        except Exception as e:
+            print(f"❌ SIMD resize failed: {e}")
+            return ConversionResult(False)
+
+    def _ffmpeg_available(self) -> bool:
+        """Check for FFmpeg once and reuse the answer"""
+        if self._ffmpeg_ok is None:
+            self._ffmpeg_ok = self.video_converter._check_dependencies()
+        return self._ffmpeg_ok
+
+    def _detect_hw_backend(self):
+        """Return the hardware backend VideoConverter picks for --device auto, or None"""
+        # Same tables and FFmpeg probe as the converter, so the demo can't disagree with it
+        return self.video_converter._hw_backend(EncodeJob(device='auto'))
+
+    def _batch_pipeline(self, files: list, out_dir: str, **opts) -> dict:
+        """Batch convert through concurrent read -> encode -> write stages
+
+        The encode stage is ImageConverter.encode_to_bytes, so resizing,
+        optimization and save options are exactly what convert() applies.
+        """
+        output_dir = Path(out_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_format = opts.get('format', 'png')
+
+        # Bounded queues keep at most a few decoded images in memory
+        decoded = queue.Queue(maxsize=4)
+        encoded = queue.Queue(maxsize=4)
+        results = {path: False for path in files}
+
+        def read_one(path):
+            try:
+                img = Image.open(path)
+                img.load()
+                decoded.put((path, img))
+            except Exception as e:
+                print(f"❌ Could not read {path}: {e}")
+
+        def reader():
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+                list(pool.map(read_one, files))
+            decoded.put(None)
+
+        def encoder():
+            while (item := decoded.get()) is not None:
+                path, img = item
+                data = self.image_converter.encode_to_bytes(img, **opts)
+                if data is None:
+                    print(f"❌ Could not encode {path}")
+                else:
+                    encoded.put((path, data))
+            encoded.put(None)
+
+        def writer():
+            while (item := encoded.get()) is not None:
+                path, data = item
+                output_file = output_dir / f"{Path(path).stem}.{output_format}"
+                try:
+                    print(f"Processing: {Path(path).name}")
+                    output_file.write_bytes(data)
+                    results[path] = True
+                except OSError as e:
+                    print(f"❌ Could not write {output_file}: {e}")
+
+        stages = [threading.Thread(target=stage) for stage in (reader, encoder, writer)]
+        for stage in stages:
+            stage.start()
+        for stage in stages:
+            stage.join()
+
+        return results
+
+    def _track(self, path: str, size: Optional[int] = None, release: bool = False) -> int:
+        """Record a demo file for cleanup and cache its size
+
+        release=True drops the file from the page cache; pass it only for
+        outputs the demo doesn't read again, never for inputs it is about to use.
+        """
+        if size is None:
+            size = os.stat(path).st_size
+        if release:
+            _release_pagecache(path)
+        with self._lock:
+            self.demo_files[path] = size
+        return size
+
+    def _demo_template(self, size: tuple, color: str) -> Image.Image:
+        """Return the cached background, border and ellipse for a size and color"""
+        key = (tuple(size), color)
+        template = self._template_cache.get(key)
+        if template is None:
+            width, height = size
+            template = Image.new('RGB', size, color=color)
+
+            # Paint the 4px border as solid fills instead of a drawn outline
+            for box in ((50, 50, width-49, 54), (50, height-53, width-49, height-49),
+                        (50, 50, 54, height-49), (width-53, 50, width-49, height-49)):
+                template.paste('navy', box)
+
+            draw = ImageDraw.Draw(template)
+            draw.ellipse([150, 150, width-150, height-150], fill='lightcoral', outline='darkred', width=3)
+            self._template_cache[key] = template
+        return template
+
     def create_demo_image(self, filename: str, size: tuple = (800, 600), color: str = 'lightblue'):
         """Create a demonstration image"""
         try:
-            img = Image.new('RGB', size, color=color)
+            img = self._demo_template(size, color).copy()
             draw = ImageDraw.Draw(img)
 
-            # Add decorative elements
-            draw.rectangle([50, 50, size[0]-50, size[1]-50], outline='navy', width=4)
-            draw.ellipse([150, 150, size[0]-150, size[1]-150], fill='lightcoral', outline='darkred', width=3)
-
             # Add text
             try:
-                font = ImageFont.load_default()
+                font = self._font
+                if font is None:
+                    raise ValueError("Default font unavailable")
                 text = f"Demo Image {size[0]}x{size[1]}"
-                bbox = draw.textbbox((0, 0), text, font=font)
-                text_width = bbox[2] - bbox[0]
+                text_width = int(self._glyph_w * len(text))  # Estimate; avoids a render pass
                 text_x = (size[0] - text_width) // 2
                 draw.text((text_x, 100), text, fill='navy', font=font)
 
@@ -76,9 +260,10 @@ class MediaConverterDemo:
             except Exception:
                 draw.text((size[0]//2 - 100, 100), "Demo Image", fill='navy')
 
-            img.save(filename, 'JPEG', quality=95)
-            self.demo_files.append(filename)
-            print(f"✅ Created demo image: {filename}")
+            self._encode_jpeg(img, filename, quality=95)
+            self._track(filename)
+            with self._lock:
+                print(f"✅ Created demo image: {filename}")
             return True
 
         except Exception as e:
@@ -105,16 +290,20 @@ class MediaConverterDemo:
             ("demo_small.jpg", (400, 300), 'lightcoral')
         ]
 
-        for filename, size, color in demo_images:
-            if self.create_demo_image(filename, size, color):
-                file_size = Path(filename).stat().st_size
+        # The images are independent, so draw and encode them concurrently
+        with ThreadPoolExecutor(max_workers=len(demo_images)) as executor:
+            created = list(executor.map(lambda args: self.create_demo_image(*args), demo_images))
+
+        for (filename, size, color), ok in zip(demo_images, created):
+            if ok:
+                file_size = self.demo_files[filename]
                 print(f"   Size: {file_size:,} bytes ({size[0]}x{size[1]})")
 
         self.wait_for_user("Press Enter to start conversions...")
 
         # Demonstrate format conversion
         self.print_step("2", "Format Conversion (JPEG → WebP)")
-        success = self.image_converter.convert(
+        result = self.image_converter.convert(
             "demo_photo.jpg",
             "demo_photo.webp",
             format='webp',
@@ -122,73 +311,78 @@ class MediaConverterDemo:
             optimize=True
         )
 
-        if success:
-            original_size = Path("demo_photo.jpg").stat().st_size
-            converted_size = Path("demo_photo.webp").stat().st_size
+        if result:
+            original_size = self.demo_files["demo_photo.jpg"]
+            converted_size = self._track("demo_photo.webp", result.nbytes, release=True)
             reduction = ((original_size - converted_size) / original_size) * 100
             print(f"✅ Conversion successful!")
             print(f"   Original (JPEG): {original_size:,} bytes")
             print(f"   Converted (WebP): {converted_size:,} bytes")
             print(f"   Size reduction: {reduction:.1f}%")
-            self.demo_files.append("demo_photo.webp")
 
         # Demonstrate resizing
         self.print_step("3", "Image Resizing (50% reduction)")
-        success = self.image_converter.convert(
-            "demo_large.jpg",
-            "demo_resized.jpg",
-            resize="50%",
-            quality=85,
-            optimize=True
-        )
+        if _resizer is not None:
+            result = self._resize_simd("demo_large.jpg", "demo_resized.jpg", 0.5, quality=85)
+        else:
+            result = self.image_converter.convert(
+                "demo_large.jpg",
+                "demo_resized.jpg",
+                resize="50%",
+                quality=85,
+                optimize=True
+            )
 
-        if success:
-            original_info = self.image_converter.get_image_info("demo_large.jpg")
-            resized_info = self.image_converter.get_image_info("demo_resized.jpg")
+        if result:
+            original_info = self.image_converter.get_image_info("demo_large.jpg", include_exif=False)
+            self._track("demo_resized.jpg", result.nbytes, release=True)
             print(f"✅ Resize successful!")
             print(f"   Original: {original_info['width']}x{original_info['height']} ({original_info['file_size']:,} bytes)")
-            print(f"   Resized:  {resized_info['width']}x{resized_info['height']} ({resized_info['file_size']:,} bytes)")
-            self.demo_files.append("demo_resized.jpg")
+            print(f"   Resized:  {result.width}x{result.height} ({result.nbytes:,} bytes)")
 
         # Demonstrate compression levels
         self.print_step("4", "Quality Comparison")
         qualities = [60, 80, 95]
 
+        # Each quality level is an independent encode, so run them in parallel
+        outcomes = {}
+        with ProcessPoolExecutor(max_workers=len(qualities)) as executor:
+            futures = {
+                executor.submit(_encode_one, "demo_photo.jpg", f"demo_quality_{quality}.jpg", quality): quality
+                for quality in qualities
+            }
+            for future in as_completed(futures):
+                outcomes[futures[future]] = future.result()
+
         for quality in qualities:
             output_file = f"demo_quality_{quality}.jpg"
-            success = self.image_converter.convert(
-                "demo_photo.jpg",
-                output_file,
-                quality=quality,
-                optimize=True
-            )
-
-            if success:
-                file_size = Path(output_file).stat().st_size
+            if outcomes[quality]:
+                file_size = self._track(output_file, outcomes[quality].nbytes, release=True)
                 print(f"   Quality {quality}%: {file_size:,} bytes")
-                self.demo_files.append(output_file)
 
         # Demonstrate batch processing
         self.print_step("5", "Batch Processing")
         batch_files = ["demo_large.jpg", "demo_photo.jpg", "demo_small.jpg"]
         os.makedirs("batch_output", exist_ok=True)
 
-        results = self.image_converter.batch_convert(
+        results = self._batch_pipeline(
             batch_files,
             "batch_output",
             format='png',
             quality=90,
-            optimize=True
+            optimize=True,
+            compress_level=1  # Fast zlib level; demo runtime matters more than bytes
         )
 
         successful = sum(1 for result in results.values() if result)
         print(f"✅ Batch conversion: {successful}/{len(batch_files)} files processed")
 
-        # Add batch output to cleanup
-        for file in batch_files:
-            batch_file = Path("batch_output") / f"{Path(file).stem}.png"
-            if batch_file.exists():
-                self.demo_files.append(str(batch_file))
+        # Add batch output to cleanup, listing the directory once
+        expected_stems = {Path(file).stem for file in batch_files}
+        with os.scandir("batch_output") as entries:
+            for entry in entries:
+                if entry.is_file() and Path(entry.name).stem in expected_stems:
+                    self._track(entry.path, entry.stat().st_size, release=True)
 
         print("\n📊 Image Demo Summary:")
         print(f"• Created {len(demo_images)} demo images")
@@ -201,7 +395,7 @@ class MediaConverterDemo:
         self.print_header("VIDEO PROCESSING DEMO")
 
         # Check if FFmpeg is available
-        if not self.video_converter._check_dependencies():
+        if not self._ffmpeg_available():
             print("❌ FFmpeg not available - skipping video demos")
             print("\nTo enable video features:")
             print("• macOS: brew install ffmpeg")
@@ -229,6 +423,22 @@ class MediaConverterDemo:
         print("   python3 media_converter.py video large.avi --resolution 1280x720 --compress")
         print("   python3 media_converter.py video movie.mp4 --start 00:01:00 --duration 00:02:00")
 
+        backend = self._detect_hw_backend()
+        if backend:
+            converter = self.video_converter
+            job = EncodeJob(device='auto')
+            encoder = converter.hw_codecs[backend][job.video_codec]
+            device = next(name for name, value in converter.hw_devices.items() if value == backend)
+            hwaccel = ' '.join(converter._build_input_options(job))
+            scale = converter.hw_decoders[backend][1] or 'scale'
+            print(f"\n⚡ Hardware encoder detected: {encoder}")
+            print(f"   python3 media_converter.py video input.mov --device {device}")
+            print("   Equivalent hardware-accelerated FFmpeg commands:")
+            print(f"   ffmpeg {hwaccel} -i input.mov -c:v {encoder} output.mp4")
+            print(f"   ffmpeg {hwaccel} -i large.avi -vf {scale}=1280:720 -c:v {encoder} output.mp4")
+        else:
+            print("\n💻 No hardware encoder detected - FFmpeg will use libx264 on the CPU")
+
     def demo_cli_interface(self):
         """Demonstrate CLI interface"""
         self.print_header("CLI INTERFACE DEMO")
@@ -259,7 +469,7 @@ class MediaConverterDemo:
             result = cli.run(['image', 'cli_demo.jpg', '--format', 'webp', '--quality', '75'])
             if result == 0:
                 print("✅ CLI command executed successfully!")
-                self.demo_files.append("cli_demo.webp")
+                self._track("cli_demo.webp", release=True)
         except Exception as e:
             print(f"❌ CLI demo failed: {e}")
 
@@ -282,15 +492,16 @@ class MediaConverterDemo:
             "api_demo.png",
             format='png',
             quality=90,
-            optimize=True
+            optimize=True,
+            compress_level=1
         )
 
         if success:
             print("✅ Direct API conversion successful!")
-            self.demo_files.append("api_demo.png")
+            self._track("api_demo.png")
 
             # Show file info
-            info = self.image_converter.get_image_info("api_demo.png")
+            info = self.image_converter.get_image_info("api_demo.png", include_exif=False)
             if info:
                 print(f"   Result: {info['format']} {info['width']}x{info['height']}")
                 print(f"   File size: {info['file_size']:,} bytes")
@@ -309,14 +520,14 @@ class MediaConverterDemo:
         print(f"   Supported output formats: {len(formats['output'])}")
 
         # File size estimation
-        if Path("api_demo.jpg").exists():
+        if "api_demo.jpg" in self.demo_files:
             estimated_size = self.image_converter.estimate_file_size(
                 "api_demo.jpg",
                 format='webp',
                 quality=70
             )
             if estimated_size:
-                original_size = Path("api_demo.jpg").stat().st_size
+                original_size = self.demo_files["api_demo.jpg"]
                 print(f"   Estimated WebP size: {estimated_size:,} bytes")
                 print(f"   Estimated reduction: {((original_size - estimated_size) / original_size * 100):.1f}%")
 
@@ -341,32 +552,42 @@ class MediaConverterDemo:
             ('png', None, 'PNG Lossless')
         ]
 
-        original_size = Path(test_image).stat().st_size
+        original_size = self.demo_files[test_image]
         results = []
 
         print(f"\nOriginal JPEG: {original_size:,} bytes")
         print("\nConversion Results:")
         print("-" * 50)
 
+        # Decode the source once and re-encode it in memory for every configuration;
+        # outputs are only written to disk when KEEP_PERF_FILES is set
+        keep_files = bool(os.environ.get('KEEP_PERF_FILES'))
+        src = Image.open(test_image)
+        src.load()
+
         for fmt, quality, label in test_configs:
             output_file = f"perf_{fmt}_{quality or 'lossless'}.{fmt}"
 
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             options = {'format': fmt, 'optimize': True}
             if quality is not None:
                 options['quality'] = quality
 
-            success = self.image_converter.convert(test_image, output_file, **options)
-            end_time = time.time()
+            data = self.image_converter.encode_to_bytes(src, **options)
+            processing_time = (time.perf_counter_ns() - start_ns) / 1e9
 
-            if success:
-                file_size = Path(output_file).stat().st_size
+            if data is not None:
+                file_size = len(data)
+                if keep_files:
+                    with open(output_file, 'wb') as f:
+                        f.write(data)
+                    self._track(output_file, file_size, release=True)
                 reduction = ((original_size - file_size) / original_size) * 100
-                processing_time = end_time - start_time
 
                 print(f"{label:12}: {file_size:7,} bytes ({reduction:+5.1f}%) {processing_time:.2f}s")
                 results.append((label, file_size, reduction))
-                self.demo_files.append(output_file)
+
+        src.close()
 
         # Find best compression
         if results:
@@ -388,7 +609,7 @@ class MediaConverterDemo:
         print("• ✅ Performance comparisons")
         print("• ✅ Error handling")
 
-        if self.video_converter._check_dependencies():
+        if self._ffmpeg_available():
             print("• ✅ Video processing ready (FFmpeg available)")
         else:
             print("• ⚠️  Video processing needs FFmpeg installation")
@@ -410,22 +631,25 @@ class MediaConverterDemo:
         """Clean up demo files"""
         print(f"\n🧹 Cleaning up {len(self.demo_files)} demo files...")
 
-        removed = 0
-        for file_path in self.demo_files:
+        def remove(file_path):
             try:
-                if Path(file_path).exists():
-                    os.remove(file_path)
-                    removed += 1
+                Path(file_path).unlink()
+                return True
+            except FileNotFoundError:
+                return False
             except Exception as e:
                 print(f"   ⚠️  Could not remove {file_path}: {e}")
+                return False
+
+        # Issue the unlinks concurrently; each one blocks on the filesystem
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            removed = sum(executor.map(remove, list(self.demo_files)))
 
         # Clean up batch_output directory
         try:
             batch_dir = Path("batch_output")
             if batch_dir.exists():
-                for file in batch_dir.iterdir():
-                    file.unlink()
-                batch_dir.rmdir()
+                shutil.rmtree(batch_dir, ignore_errors=True)
                 print("   ✅ Removed batch_output directory")
         except Exception as e:
             print(f"   ⚠️  Could not clean batch_output: {e}")
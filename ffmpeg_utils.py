@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+FFmpeg Utilities
+Locates the FFmpeg and FFprobe executables once per process
+"""
+
+import re
+import shutil
+import subprocess
+from functools import lru_cache
+from typing import FrozenSet, Optional
+
+# Encoder lines in `ffmpeg -encoders` look like " V....D libx264    libx264 H.264 ..."
+_ENCODER_RE = re.compile(r'^ [VAS][A-Z.]{5} ([^\s=]\S*)', re.MULTILINE)
+
+
+@lru_cache(maxsize=1)
+def find_ffmpeg() -> Optional[str]:
+    """Find FFmpeg executable
+
+    Returns:
+        Path to ffmpeg, or None if it is not on PATH
+    """
+    return shutil.which('ffmpeg')
+
+
+@lru_cache(maxsize=1)
+def find_ffprobe() -> Optional[str]:
+    """Find FFprobe executable
+
+    Returns:
+        Path to ffprobe, or None if it is not on PATH
+    """
+    return shutil.which('ffprobe')
+
+
+@lru_cache(maxsize=1)
+def ffmpeg_version() -> Optional[str]:
+    """Get the first line of `ffmpeg -version`
+
+    Only this spawns FFmpeg, and only on the first call, so finding the
+    executable stays free for callers that never need the version.
+
+    Returns:
+        Version line, or None if FFmpeg is missing or does not run
+    """
+    ffmpeg_path = find_ffmpeg()
+    if not ffmpeg_path:
+        return None
+
+    # Only stdout carries the version text; stderr is discarded rather than drained
+    try:
+        result = subprocess.run([ffmpeg_path, '-hide_banner', '-version'],
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                text=True, timeout=2)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+    if result.returncode != 0:
+        return None
+    return result.stdout.partition('\n')[0]
+
+
+@lru_cache(maxsize=1)
+def ffmpeg_encoders() -> FrozenSet[str]:
+    """Get the names of the encoders this FFmpeg build offers
+
+    Returns:
+        Encoder names (e.g. 'libx264', 'h264_nvenc'); empty if FFmpeg is unavailable
+    """
+    return frozenset(_ENCODER_RE.findall(_ffmpeg_listing('-encoders')))
+
+
+@lru_cache(maxsize=1)
+def ffmpeg_hwaccels() -> FrozenSet[str]:
+    """Get the hardware decoding methods this FFmpeg build supports
+
+    Returns:
+        hwaccel names (e.g. 'cuda', 'qsv', 'vaapi'); empty if FFmpeg is unavailable
+    """
+    # Skip the "Hardware acceleration methods:" header line
+    return frozenset(line.strip() for line in _ffmpeg_listing('-hwaccels').splitlines()
+                     if line.strip() and not line.rstrip().endswith(':'))
+
+
+def _ffmpeg_listing(flag: str) -> str:
+    """Run `ffmpeg -hide_banner <flag>` and return its stdout"""
+    ffmpeg_path = find_ffmpeg()
+    if not ffmpeg_path:
+        return ''
+
+    try:
+        result = subprocess.run([ffmpeg_path, '-hide_banner', flag],
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return ''
+    return result.stdout
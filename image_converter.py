@@ -5,23 +5,183 @@ Handles image conversion, compression, and manipulation using Pillow (PIL)
 """
 
 import os
+import re
 import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional, Union, Tuple, List
-from PIL import Image, ImageOps, ImageFilter, ExifTags
+from typing import Dict, Optional, Union, Tuple, List, NamedTuple
+import PIL
+from PIL import Image, ImageOps, ImageFilter, ExifTags, PngImagePlugin, features
 from PIL.ExifTags import TAGS
 import io
 
+# Optional lossless JPEG optimizer (jpegtran-style Huffman re-coding from mozjpeg)
+try:
+    import mozjpeg_lossless_optimization
+except ImportError:
+    mozjpeg_lossless_optimization = None
+
+# Optional libimagequant bindings for palette reduction when Pillow isn't built with it
+try:
+    import imagequant
+except ImportError:
+    imagequant = None
+
+# Pillow can only use libimagequant if it was compiled against it
+_HAS_LIBIMAGEQUANT = features.check_feature('libimagequant')
+
+# Pillow-SIMD installs as "Pillow" with a ".postN" version suffix
+PILLOW_SIMD = '.post' in PIL.__version__
+
+# Optional libvips bindings for the streaming backend='vips' path
+try:
+    import pyvips
+except (ImportError, OSError):
+    # OSError: bindings installed but the libvips shared library is missing
+    pyvips = None
+
+
+# Sum of the IJG standard luminance quantization table, i.e. JPEG quality 50
+_STD_LUMA_QTABLE_SUM = 3688
+
+# Options that change pixels in ways only the Pillow pipeline handles
+_FILTER_OPTIONS = ('sharpen', 'blur', 'auto_enhance', 'watermark')
+
+# Options that make convert() decode and re-encode rather than copy the file
+_REENCODE_OPTIONS = _FILTER_OPTIONS + (
+    'resize', 'strip_metadata', 'quality', 'optimize', 'progressive', 'compress', 'compress_level'
+)
+
+def _jpeg_save_options(quality: int, options: Dict) -> Dict:
+    """Pillow save options for JPEG output"""
+    save_options = {'quality': quality, 'optimize': options.get('optimize', True)}
+    if options.get('progressive'):
+        save_options['progressive'] = True
+    return save_options
+
+
+def _png_save_options(quality: int, options: Dict) -> Dict:
+    """Pillow save options for PNG output"""
+    # An explicit zlib level wins over optimize, which forces level 9
+    if options.get('compress_level') is not None:
+        return {'compress_level': options['compress_level']}
+    return {'optimize': options.get('optimize', True)}
+
+
+def _webp_save_options(quality: int, options: Dict) -> Dict:
+    """Pillow save options for WebP output"""
+    return {'quality': quality, 'optimize': options.get('optimize', True)}
+
+
+# Save option builders by Pillow format name; other formats take no options
+_SAVE_OPT_BUILDERS = {
+    'JPEG': _jpeg_save_options,
+    'PNG': _png_save_options,
+    'WebP': _webp_save_options,
+}
+
+# Resize specs: '50%', '1920x1080', '800x', 'x600' or a bare width '800'
+_RESIZE_RE = re.compile(r'\s*(?:(\d+(?:\.\d+)?)%|(\d*)[xX](\d*)|(\d+))\s*')
+
+
+@lru_cache(maxsize=128)
+def _parse_resize_spec(resize_spec: str) -> Tuple[Optional[float], Optional[int], Optional[int], Optional[int]]:
+    """Split a resize spec into (scale, width, height, aspect_width); unused parts are None"""
+    match = _RESIZE_RE.fullmatch(resize_spec)
+    if not match:
+        raise ValueError(f"Invalid resize specification '{resize_spec}'")
+    percent, width, height, aspect_width = match.groups()
+    return (
+        float(percent) / 100 if percent is not None else None,
+        int(width) if width else None,
+        int(height) if height else None,
+        int(aspect_width) if aspect_width is not None else None,
+    )
+
+
+def _write_file(path: str, data) -> int:
+    """
+    Write a whole encoded image with raw os.write calls, skipping the
+    buffered IO layer (usually a single syscall)
+
+    Args:
+        path: Output file path
+        data: bytes-like object holding the encoded image
+
+    Returns:
+        Number of bytes written
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(path, flags, 0o644)
+    try:
+        with memoryview(data) as view:
+            written = 0
+            while written < len(view):
+                written += os.write(fd, view[written:])
+        return written
+    finally:
+        os.close(fd)
+
+
+def _normsuffix(path: str) -> str:
+    """Lowercased file extension including the dot, e.g. '.jpg'"""
+    return os.path.splitext(path)[1].lower()
+
+
+@lru_cache(maxsize=32)
+def _opacity_lut(opacity: float) -> bytes:
+    """256-entry lookup table scaling an alpha band by opacity"""
+    return bytes(max(0, int(p * opacity)) for p in range(256))
+
+
+class ConversionResult(NamedTuple):
+    """Outcome of an image conversion; truthy only when it succeeded"""
+    ok: bool
+    nbytes: int = 0
+    width: int = 0
+    height: int = 0
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+
+def _prefetch(paths: List[str]):
+    """Ask the kernel to start reading files ahead of use (POSIX only; no-op elsewhere)"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+
+
+# Converter reused by every task a batch worker process runs
+_worker_converter = None
+
+
+def _convert_worker(input_path: str, output_path: str, options: Dict) -> ConversionResult:
+    """Convert one file inside a batch_convert worker process"""
+    global _worker_converter
+    if _worker_converter is None:
+        _worker_converter = ImageConverter()
+    return _worker_converter.convert(input_path, output_path, **options)
+
 
 class ImageConverter:
     """A class for converting and compressing images using Pillow"""
 
     def __init__(self):
         # Supported input formats
-        self.supported_input_formats = {
+        self.supported_input_formats = frozenset({
             '.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif',
             '.webp', '.gif', '.ico', '.ppm', '.pgm', '.pbm'
-        }
+        })
 
         # Supported output formats
         self.supported_output_formats = {
@@ -43,6 +203,12 @@ class ImageConverter:
             'maximum': 100
         }
 
+        # Output formats the vips backend can write, by file extension
+        self.vips_output_formats = {'jpg', 'jpeg', 'png', 'webp', 'tiff'}
+
+        # Longest side of the probe image encoded by estimate_file_size
+        self.estimate_probe_size = 512
+
     def _check_dependencies(self) -> bool:
         """Check if required dependencies are available"""
         try:
@@ -53,8 +219,17 @@ class ImageConverter:
             print("  pip install Pillow")
             return False
 
-    def get_image_info(self, input_path: str) -> Optional[Dict]:
-        """Get image information"""
+    def get_image_info(self, input_path: str, include_exif: bool = True) -> Optional[Dict]:
+        """
+        Get image information
+
+        Args:
+            input_path: Path to input image
+            include_exif: Also read EXIF tags; skip to parse only the header
+
+        Returns:
+            Dict of image properties, or None if the image can't be read
+        """
         try:
             with Image.open(input_path) as img:
                 info = {
@@ -67,13 +242,16 @@ class ImageConverter:
                 }
 
                 # Get EXIF data if available
-                if hasattr(img, '_getexif') and img._getexif() is not None:
-                    exif_dict = {}
-                    exif = img._getexif()
-                    for tag_id, value in exif.items():
-                        tag = TAGS.get(tag_id, tag_id)
-                        exif_dict[tag] = value
-                    info['exif'] = exif_dict
+                exif = img.getexif() if include_exif else None
+                if exif:
+                    # Flatten the Exif sub-IFD (camera settings) into the
+                    # main tags and nest GPS data, as _getexif() did
+                    tags = dict(exif)
+                    tags.update(exif.get_ifd(ExifTags.IFD.Exif))
+                    gps = exif.get_ifd(ExifTags.IFD.GPSInfo)
+                    if gps:
+                        tags[ExifTags.IFD.GPSInfo] = gps
+                    info['exif'] = {TAGS.get(tag_id, tag_id): value for tag_id, value in tags.items()}
 
                 # File size
                 info['file_size'] = Path(input_path).stat().st_size
@@ -86,49 +264,60 @@ class ImageConverter:
     def _parse_resize(self, resize_spec: str, original_size: Tuple[int, int]) -> Tuple[int, int]:
         """Parse resize specification"""
         width, height = original_size
+        percentage, new_width, new_height, aspect_width = _parse_resize_spec(resize_spec)
 
-        if resize_spec.endswith('%'):
+        if percentage is not None:
             # Percentage resize
-            percentage = float(resize_spec[:-1]) / 100
             return int(width * percentage), int(height * percentage)
-        elif 'x' in resize_spec.lower():
-            # Explicit dimensions
-            parts = resize_spec.lower().split('x')
-            new_width = int(parts[0]) if parts[0] else width
-            new_height = int(parts[1]) if parts[1] else height
-            return new_width, new_height
-        else:
+        elif aspect_width is not None:
             # Single number - assume width, maintain aspect ratio
-            new_width = int(resize_spec)
             aspect_ratio = height / width
-            new_height = int(new_width * aspect_ratio)
-            return new_width, new_height
+            return aspect_width, int(aspect_width * aspect_ratio)
+        else:
+            # Explicit dimensions
+            return (new_width if new_width is not None else width,
+                    new_height if new_height is not None else height)
+
+    def _quantize(self, img: Image.Image) -> Image.Image:
+        """Convert to an adaptive 256-color palette"""
+        # libimagequant (pngquant's engine) is faster and picks better palettes
+        # than Pillow's median cut; fall back to median cut without it
+        if _HAS_LIBIMAGEQUANT:
+            return img.quantize(256, method=Image.Quantize.LIBIMAGEQUANT)
+        if imagequant is not None:
+            return imagequant.quantize_pil_image(img, max_colors=256)
+        return img.convert('P', palette=Image.ADAPTIVE, colors=256)
 
     def _optimize_image(self, img: Image.Image, format_name: str, **options) -> Image.Image:
         """Apply optimization settings to image"""
-        # Handle transparency for formats that don't support it
-        if format_name == 'JPEG' and img.mode in ('RGBA', 'LA'):
-            # Convert RGBA to RGB with white background
-            background = Image.new('RGB', img.size, (255, 255, 255))
-            if img.mode == 'RGBA':
-                background.paste(img, mask=img.split()[-1])  # Use alpha channel as mask
-            else:
-                background.paste(img)
-            img = background
-        elif format_name == 'JPEG' and img.mode not in ('RGB', 'L'):
-            img = img.convert('RGB')
+        img = self._flatten_for_format(img, format_name)
 
         # Handle PNG optimization
         if format_name == 'PNG' and img.mode == 'RGB':
             # Convert RGB to P mode with palette for better compression
             if options.get('optimize', True):
                 try:
-                    img = img.convert('P', palette=Image.ADAPTIVE, colors=256)
+                    img = self._quantize(img)
                 except:
                     pass  # Keep original if conversion fails
 
         return img
 
+    def _flatten_for_format(self, img: Image.Image, format_name: str) -> Image.Image:
+        """Convert image to a mode the target format can store"""
+        # Handle transparency for formats that don't support it
+        if format_name == 'JPEG' and img.mode in ('RGBA', 'LA'):
+            # Convert RGBA to RGB with white background
+            # Passing the image itself as the mask makes paste use its alpha
+            # band in place, without split() copying out every band first
+            background = Image.new('RGB', img.size, (255, 255, 255))
+            background.paste(img, mask=img)
+            img = background
+        elif format_name == 'JPEG' and img.mode not in ('RGB', 'L'):
+            img = img.convert('RGB')
+
+        return img
+
     def _apply_filters(self, img: Image.Image, **options) -> Image.Image:
         """Apply image filters and effects"""
         # Sharpen
@@ -146,8 +335,20 @@ class ImageConverter:
 
         return img
 
-    def _add_watermark(self, img: Image.Image, watermark_path: str, **options) -> Image.Image:
-        """Add watermark to image"""
+    def _add_watermark(self, img: Image.Image, watermark_path: str,
+                       format_name: Optional[str] = None, in_place: bool = False,
+                       **options) -> Image.Image:
+        """Add watermark to image
+
+        Args:
+            img: Image to watermark
+            watermark_path: Path to watermark image
+            format_name: Target format, opaque formats skip the RGBA conversion
+            in_place: Paste into img directly when the caller owns it
+
+        Returns:
+            Watermarked image
+        """
         try:
             with Image.open(watermark_path) as watermark:
                 # Resize watermark if needed
@@ -164,7 +365,7 @@ class ImageConverter:
                 # Apply opacity
                 if opacity < 1.0:
                     alpha = watermark.split()[-1]
-                    alpha = alpha.point(lambda p: int(p * opacity))
+                    alpha = alpha.point(_opacity_lut(opacity))
                     watermark.putalpha(alpha)
 
                 # Calculate position
@@ -182,9 +383,17 @@ class ImageConverter:
                 else:
                     pos = (10, 10)
 
-                # Convert main image to RGBA for transparency support
-                if img.mode != 'RGBA':
+                # Formats without alpha get the watermark blended straight into
+                # the opaque image; otherwise convert main image to RGBA for
+                # transparency support (copying keeps the caller's image
+                # untouched by paste)
+                if format_name in ('JPEG', 'BMP') and img.mode in ('RGB', 'L'):
+                    if not in_place:
+                        img = img.copy()
+                elif img.mode != 'RGBA':
                     img = img.convert('RGBA')
+                elif not in_place:
+                    img = img.copy()
 
                 # Paste watermark
                 img.paste(watermark, pos, watermark)
@@ -194,7 +403,7 @@ class ImageConverter:
 
         return img
 
-    def convert(self, input_path: str, output_path: str, **options) -> bool:
+    def convert(self, input_path: str, output_path: str, **options) -> ConversionResult:
         """
         Convert image with specified options
 
@@ -204,95 +413,247 @@ class ImageConverter:
             **options: Conversion options
 
         Returns:
-            bool: True if successful, False otherwise
+            ConversionResult: truthy if successful, with output size and dimensions
         """
         if not self._check_dependencies():
-            return False
+            return ConversionResult(False)
 
         input_file = Path(input_path)
         if not input_file.exists():
             print(f"Error: Input file '{input_path}' not found")
-            return False
+            return ConversionResult(False)
 
-        if input_file.suffix.lower() not in self.supported_input_formats:
+        if _normsuffix(input_path) not in self.supported_input_formats:
             print(f"Error: Unsupported input format '{input_file.suffix}'")
+            return ConversionResult(False)
+
+        if options.get('backend') == 'vips':
+            result = self._convert_vips(input_path, output_path, **options)
+            if result is not None:
+                return result
+
+        try:
+            with Image.open(input_path) as img:
+                # Nothing to change: copy the file rather than decode and re-encode it
+                if self._is_passthrough(img.format, output_path, **options):
+                    return self._copy_file(input_path, output_path, img.size)
+
+                if options.get('resize') and img.format == 'JPEG':
+                    # Let libjpeg decode at a reduced DCT scale, keeping 2x headroom
+                    # for the Lanczos pass; pin the target so it isn't re-derived
+                    # from the smaller draft size
+                    new_width, new_height = self._parse_resize(options['resize'], img.size)
+                    img.draft(None, (new_width * 2, new_height * 2))
+                    options['resize'] = f"{new_width}x{new_height}"
+                return self.encode_from_image(img, output_path, **options)
+
+        except Exception as e:
+            print(f"Error during conversion: {e}")
+            return ConversionResult(False)
+
+    def _is_passthrough(self, source_format: Optional[str], output_path: str, **options) -> bool:
+        """Whether converting would only rewrite the source in the same format"""
+        if any(options.get(name) for name in _REENCODE_OPTIONS):
             return False
 
+        output_format = options.get('format') or _normsuffix(output_path).lstrip('.')
+        format_name = self.supported_output_formats.get(output_format.lower())
+        return bool(source_format and format_name) and format_name.upper() == source_format.upper()
+
+    def _copy_file(self, input_path: str, output_path: str, size: Tuple[int, int]) -> ConversionResult:
+        """Copy an image unchanged; writing a file onto itself is a no-op"""
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        if not os.path.exists(output_path) or not os.path.samefile(input_path, output_path):
+            shutil.copyfile(input_path, output_path)
+        return ConversionResult(True, os.path.getsize(output_path), size[0], size[1])
+
+    def _convert_vips(self, input_path: str, output_path: str, **options) -> Optional[ConversionResult]:
+        """
+        Resize and encode through libvips, which streams the image in tiles
+        rather than holding full decoded frames between stages
+
+        Returns:
+            ConversionResult, or None if the options need the Pillow pipeline
+        """
+        if pyvips is None:
+            print("Warning: pyvips not available, using Pillow")
+            return None
+
+        # Filters and watermarks only exist in the Pillow pipeline
+        if any(options.get(name) for name in _FILTER_OPTIONS):
+            return None
+
+        output_ext = (options.get('format') or Path(output_path).suffix.lstrip('.')).lower()
+        if output_ext not in self.vips_output_formats:
+            return None
+
+        try:
+            if options.get('resize'):
+                # Opening is lazy, so reading the dimensions doesn't decode pixels
+                header = pyvips.Image.new_from_file(input_path)
+                width, height = self._parse_resize(options['resize'], (header.width, header.height))
+                img = pyvips.Image.thumbnail(input_path, width, height=height, size='force')
+            else:
+                img = pyvips.Image.new_from_file(input_path, access='sequential')
+
+            save_options = {'strip': bool(options.get('strip_metadata'))}
+            if output_ext in ('jpg', 'jpeg', 'webp'):
+                quality = options.get('quality', 85)
+                if isinstance(quality, str):
+                    quality = self.quality_presets.get(quality, 85)
+                save_options['Q'] = quality
+            if output_ext in ('jpg', 'jpeg') and options.get('progressive'):
+                save_options['interlace'] = True
+
+            data = img.write_to_buffer(f".{output_ext}", **save_options)
+
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            nbytes = _write_file(output_path, data)
+
+            return ConversionResult(True, nbytes, img.width, img.height)
+
+        except Exception as e:
+            print(f"Error during conversion: {e}")
+            return ConversionResult(False)
+
+    def _resolve_format(self, output_path: str, original_format: Optional[str], **options) -> Optional[str]:
+        """Determine the Pillow format name to save with"""
+        output_format = options.get('format')
+        if output_format:
+            format_name = self.supported_output_formats.get(output_format.lower())
+            if not format_name:
+                print(f"Error: Unsupported output format '{output_format}'")
+            return format_name
+
+        # Use output file extension or keep original format
+        output_ext = _normsuffix(output_path).lstrip('.')
+        if output_ext in self.supported_output_formats:
+            return self.supported_output_formats[output_ext]
+        return original_format
+
+    def encode_from_image(self, img: Image.Image, output_path: str, **options) -> ConversionResult:
+        """
+        Encode an already decoded image with specified options
+
+        Lets callers decode a source once and write it out several times.
+        The passed image is left unmodified.
+
+        Args:
+            img: Source image
+            output_path: Path to output image file
+            **options: Conversion options (same as convert)
+
+        Returns:
+            ConversionResult: truthy if successful, with output size and dimensions
+        """
         try:
             # Create output directory if it doesn't exist
             Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
-            with Image.open(input_path) as img:
-                # Store original format for reference
-                original_format = img.format
+            # Determine output format
+            format_name = self._resolve_format(output_path, img.format, **options)
+            if not format_name:
+                return ConversionResult(False)
 
-                # Determine output format
-                output_format = options.get('format')
-                if output_format:
-                    format_name = self.supported_output_formats.get(output_format.lower())
-                    if not format_name:
-                        print(f"Error: Unsupported output format '{output_format}'")
-                        return False
-                else:
-                    # Use output file extension or keep original format
-                    output_ext = Path(output_path).suffix.lower().lstrip('.')
-                    if output_ext in self.supported_output_formats:
-                        format_name = self.supported_output_formats[output_ext]
-                    else:
-                        format_name = original_format
-
-                # Apply resize if specified
-                if options.get('resize'):
-                    new_size = self._parse_resize(options['resize'], img.size)
-                    img = img.resize(new_size, Image.Resampling.LANCZOS)
+            buffer, img = self._encode(img, format_name, **options)
 
-                # Apply filters
-                img = self._apply_filters(img, **options)
+            # Write the encoded image; its size is known without stat-ing afterwards
+            nbytes = _write_file(output_path, buffer.getbuffer())
 
-                # Add watermark if specified
-                if options.get('watermark'):
-                    img = self._add_watermark(img, options['watermark'], **options)
+            return ConversionResult(True, nbytes, img.width, img.height)
 
-                # Get quality setting
-                quality = options.get('quality', 85)
-                if isinstance(quality, str) and quality in self.quality_presets:
-                    quality = self.quality_presets[quality]
+        except Exception as e:
+            print(f"Error during conversion: {e}")
+            return ConversionResult(False)
 
-                # Optimize image for target format
-                img = self._optimize_image(img, format_name, **options)
+    def encode_to_bytes(self, img: Image.Image, **options) -> Optional[bytes]:
+        """
+        Encode an already decoded image in memory
 
-                # Prepare save options
-                save_options = {}
-
-                if format_name == 'JPEG':
-                    save_options['quality'] = quality
-                    save_options['optimize'] = options.get('optimize', True)
-                    if options.get('progressive'):
-                        save_options['progressive'] = True
-                elif format_name == 'PNG':
-                    save_options['optimize'] = options.get('optimize', True)
-                elif format_name == 'WebP':
-                    save_options['quality'] = quality
-                    save_options['optimize'] = options.get('optimize', True)
-
-                # Remove EXIF data if requested
-                if options.get('strip_metadata', False):
-                    # Create a new image without EXIF data
-                    data = list(img.getdata())
-                    img_no_exif = Image.new(img.mode, img.size)
-                    img_no_exif.putdata(data)
-                    img = img_no_exif
-
-                # Save the image
-                img.save(output_path, format=format_name, **save_options)
+        Args:
+            img: Source image
+            **options: Conversion options; 'format' selects the output format
 
-                return True
+        Returns:
+            Encoded image bytes, or None if encoding fails
+        """
+        try:
+            format_name = self._resolve_format('', img.format, **options)
+            if not format_name:
+                return None
+
+            buffer, _ = self._encode(img, format_name, **options)
+            return buffer.getvalue()
 
         except Exception as e:
             print(f"Error during conversion: {e}")
-            return False
+            return None
+
+    def _save_options(self, format_name: str, **options) -> Dict:
+        """Build Pillow save options for a format from conversion options"""
+        builder = _SAVE_OPT_BUILDERS.get(format_name)
+        if builder is None:
+            return {}
+
+        quality = options.get('quality', 85)
+        if isinstance(quality, str) and quality in self.quality_presets:
+            quality = self.quality_presets[quality]
+        return builder(quality, options)
 
-    def compress(self, input_path: str, output_path: str, quality: Union[int, str] = 85, **options) -> bool:
+    def _encode(self, img: Image.Image, format_name: str, **options) -> Tuple[io.BytesIO, Image.Image]:
+        """Run the conversion pipeline and encode into a memory buffer
+
+        Every step works on the same in-memory image: resize, filters, mode
+        conversion, watermark, then encode with metadata stripped through
+        the save options, so pixels are never written out between steps.
+        """
+        source = img
+
+        # Apply resize if specified
+        if options.get('resize'):
+            new_size = self._parse_resize(options['resize'], img.size)
+            # reducing_gap box-reduces by an integer factor first, so Lanczos
+            # only reads a small intermediate instead of every source pixel
+            img = img.resize(new_size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+        # Apply filters
+        img = self._apply_filters(img, **options)
+
+        # Flatten to the target mode before compositing, so the watermark is
+        # pasted into the image that gets encoded instead of an RGBA copy
+        img = self._flatten_for_format(img, format_name)
+
+        # Add watermark if specified
+        if options.get('watermark'):
+            img = self._add_watermark(img, options['watermark'], format_name=format_name,
+                                      in_place=img is not source, **options)
+
+        # Optimize image for target format
+        img = self._optimize_image(img, format_name, **options)
+
+        # Prepare save options
+        save_options = self._save_options(format_name, **options)
+
+        # Remove metadata if requested. Encoders fall back to img.info (JPEG
+        # comment, XMP, ...) and to a source TIFF's own tags for anything not in
+        # the save options, so encode an image whose info is empty; only an
+        # untouched source needs copying for that, every other step made a new image
+        if options.get('strip_metadata', False):
+            if img is source:
+                img = img.copy()
+            img.info = {}
+            save_options['exif'] = b''
+            save_options['icc_profile'] = None
+            save_options['comment'] = b''
+            save_options['xmp'] = b''
+            if format_name == 'PNG':
+                save_options['pnginfo'] = PngImagePlugin.PngInfo()
+
+        buffer = io.BytesIO()
+        img.save(buffer, format=format_name, **save_options)
+        return buffer, img
+
+    def compress(self, input_path: str, output_path: str, quality: Union[int, str] = 85, **options) -> ConversionResult:
         """
         Compress image file
 
@@ -303,14 +664,74 @@ class ImageConverter:
             **options: Additional options
 
         Returns:
-            bool: True if successful, False otherwise
+            ConversionResult: truthy if successful, with output size and dimensions
         """
         options['quality'] = quality
         options['compress'] = True
         options['optimize'] = True
+
+        # Re-encoding a JPEG at or above its own quality only adds generation loss
+        result = self._compress_without_reencode(input_path, output_path, **options)
+        if result is not None:
+            return result
+
         return self.convert(input_path, output_path, **options)
 
-    def resize(self, input_path: str, output_path: str, size: str, **options) -> bool:
+    def _estimate_jpeg_quality(self, img: Image.Image) -> Optional[int]:
+        """Estimate the quality a JPEG was saved with from its luminance quantization table"""
+        tables = getattr(img, 'quantization', None)
+        if not tables or 0 not in tables:
+            return None
+
+        luma = tables[0]
+        if max(luma) == 1:
+            return 100
+
+        # Invert libjpeg's quality scaling of the standard table
+        scale = sum(luma) * 100 / _STD_LUMA_QTABLE_SUM
+        quality = (200 - scale) / 2 if scale <= 100 else 5000 / scale
+        return max(1, min(100, round(quality)))
+
+    def _compress_without_reencode(self, input_path: str, output_path: str, **options) -> Optional[ConversionResult]:
+        """Copy or losslessly optimize a JPEG that re-encoding can't improve; None if it doesn't apply"""
+        if any(options.get(name) for name in _FILTER_OPTIONS + ('resize', 'strip_metadata', 'progressive')):
+            return None
+
+        output_format = options.get('format')
+        if output_format and output_format.lower() not in self.supported_output_formats:
+            return None
+
+        quality = options.get('quality', 85)
+        if isinstance(quality, str):
+            quality = self.quality_presets.get(quality)
+        if not isinstance(quality, int):
+            return None
+
+        try:
+            with Image.open(input_path) as img:
+                if img.format != 'JPEG' or self._resolve_format(output_path, img.format, **options) != 'JPEG':
+                    return None
+                source_quality = self._estimate_jpeg_quality(img)
+                if source_quality is None or quality < source_quality:
+                    return None
+                width, height = img.size
+
+            if mozjpeg_lossless_optimization is None:
+                return self._copy_file(input_path, output_path, (width, height))
+
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            with open(input_path, 'rb') as f:
+                data = f.read()
+            optimized = mozjpeg_lossless_optimization.optimize(data)
+            if len(optimized) < len(data):
+                data = optimized
+            return ConversionResult(True, _write_file(output_path, data), width, height)
+
+        except Exception:
+            # Fall back to a normal conversion, which reports any real error
+            return None
+
+    def resize(self, input_path: str, output_path: str, size: str, **options) -> ConversionResult:
         """
         Resize image
 
@@ -321,7 +742,7 @@ class ImageConverter:
             **options: Additional options
 
         Returns:
-            bool: True if successful, False otherwise
+            ConversionResult: truthy if successful, with output size and dimensions
         """
         options['resize'] = size
         return self.convert(input_path, output_path, **options)
@@ -354,26 +775,31 @@ class ImageConverter:
             print(f"Error creating thumbnail: {e}")
             return False
 
-    def batch_convert(self, input_files: List[str], output_dir: str, **options) -> Dict[str, bool]:
+    def batch_convert(self, input_files: List[str], output_dir: str,
+                      max_workers: Optional[int] = None, **options) -> Dict[str, ConversionResult]:
         """
         Batch convert multiple image files
 
+        Files are encoded in parallel worker processes.
+
         Args:
             input_files: List of input file paths
             output_dir: Output directory
+            max_workers: Number of worker processes (default: CPU count, at most 16)
             **options: Conversion options
 
         Returns:
-            Dict mapping input files to success status
+            Dict mapping input files to conversion results
         """
         results = {}
+        jobs = []
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
 
         for input_file in input_files:
             input_path = Path(input_file)
             if not input_path.exists():
-                results[input_file] = False
+                results[input_file] = ConversionResult(False)
                 continue
 
             # Generate output filename
@@ -383,11 +809,47 @@ class ImageConverter:
             else:
                 output_file = output_path / input_path.name
 
-            print(f"Processing: {input_path.name}")
-            results[input_file] = self.convert(str(input_path), str(output_file), **options)
+            results[input_file] = None
+            jobs.append((input_file, str(input_path), str(output_file)))
+
+        # Queue readahead for every input up front so the device sees many
+        # outstanding reads instead of one blocking read per Image.open
+        _prefetch([src for _, src, _ in jobs])
+
+        if max_workers is None:
+            max_workers = min(os.cpu_count() or 1, 16)
+
+        # Not worth starting processes for a single file
+        if len(jobs) <= 1 or max_workers <= 1:
+            for input_file, src, dst in jobs:
+                print(f"Processing: {Path(src).name}")
+                results[input_file] = self.convert(src, dst, **options)
+            return results
+
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+            futures = {}
+            for input_file, src, dst in jobs:
+                print(f"Processing: {Path(src).name}")
+                futures[executor.submit(_convert_worker, src, dst, options)] = input_file
+
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    print(f"Error during conversion: {e}")
+                    results[futures[future]] = ConversionResult(False)
 
         return results
 
+    def get_backend_info(self) -> Dict[str, object]:
+        """Describe the imaging libraries in use"""
+        return {
+            'pillow': PIL.__version__,
+            'pillow_simd': PILLOW_SIMD,
+            'vips': pyvips is not None,
+            'libimagequant': _HAS_LIBIMAGEQUANT or imagequant is not None,
+        }
+
     def get_supported_formats(self) -> Dict[str, List[str]]:
         """Get list of supported formats"""
         return {
@@ -408,41 +870,42 @@ class ImageConverter:
         """
         try:
             with Image.open(input_path) as img:
-                # Create a copy for testing
-                test_img = img.copy()
-
-                # Apply resize if specified
+                # Output dimensions after any requested resize
+                width, height = img.size
                 if options.get('resize'):
-                    new_size = self._parse_resize(options['resize'], img.size)
-                    test_img = test_img.resize(new_size, Image.Resampling.LANCZOS)
+                    width, height = self._parse_resize(options['resize'], img.size)
+
+                # Large images are estimated from a downsampled probe; compressed
+                # size grows roughly linearly with pixel count at a fixed quality
+                scale = 1.0
+                probe = self.estimate_probe_size
+                if width > probe or height > probe:
+                    ratio = probe / max(width, height)
+                    probe_size = (max(1, round(width * ratio)), max(1, round(height * ratio)))
+                    scale = (width * height) / (probe_size[0] * probe_size[1])
+
+                    # JPEGs decode straight to a reduced DCT scale, skipping most IDCT work
+                    img.draft(img.mode, probe_size)
+                    test_img = img.resize(probe_size, Image.Resampling.LANCZOS)
+                elif options.get('resize'):
+                    img.draft(img.mode, (width, height))
+                    test_img = img.resize((width, height), Image.Resampling.LANCZOS)
+                else:
+                    # Create a copy for testing
+                    test_img = img.copy()
 
                 # Determine output format
                 output_format = options.get('format', 'jpeg')
                 format_name = self.supported_output_formats.get(output_format.lower(), 'JPEG')
 
-                # Get quality
-                quality = options.get('quality', 85)
-                if isinstance(quality, str) and quality in self.quality_presets:
-                    quality = self.quality_presets[quality]
-
                 # Optimize for target format
                 test_img = self._optimize_image(test_img, format_name, **options)
 
                 # Save to memory buffer to estimate size
                 buffer = io.BytesIO()
-                save_options = {}
-
-                if format_name == 'JPEG':
-                    save_options['quality'] = quality
-                    save_options['optimize'] = options.get('optimize', True)
-                elif format_name == 'PNG':
-                    save_options['optimize'] = options.get('optimize', True)
-                elif format_name == 'WebP':
-                    save_options['quality'] = quality
-                    save_options['optimize'] = options.get('optimize', True)
-
+                save_options = self._save_options(format_name, **options)
                 test_img.save(buffer, format=format_name, **save_options)
-                return len(buffer.getvalue())
+                return int(buffer.tell() * scale)
 
         except Exception as e:
             print(f"Error estimating file size: {e}")
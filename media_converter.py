@@ -5,28 +5,138 @@ A comprehensive video and image converter/compressor with class-based architectu
 """
 
 import argparse
+import asyncio
+import io
+import logging
 import sys
 import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property, lru_cache
+from glob import glob
 from pathlib import Path
-from typing import List, Optional
-
-try:
-    from video_converter import VideoConverter
-    from image_converter import ImageConverter
-except ImportError:
-    import sys
-    from pathlib import Path
-    sys.path.insert(0, str(Path(__file__).parent))
-    from video_converter import VideoConverter
-    from image_converter import ImageConverter
+from typing import Dict, List, Optional, Tuple
+
+# The converters are imported on first use (Pillow is slow to load), so make
+# sure they resolve from any working directory
+_SCRIPT_DIR = str(Path(__file__).parent)
+if _SCRIPT_DIR not in sys.path:
+    sys.path.append(_SCRIPT_DIR)
+
+
+# Argument choices, allocated once at import; tuples keep --help output in a fixed order
+_VIDEO_FORMATS = ('mp4', 'avi', 'mkv', 'webm', 'mov')
+_VIDEO_QUALITIES = ('low', 'medium', 'high', 'lossless')
+_AUDIO_CODECS = ('aac', 'mp3', 'opus', 'none')
+_VIDEO_CODECS = ('h264', 'h265', 'vp9', 'av1')
+_VIDEO_PRESETS = ('ultrafast', 'superfast', 'veryfast', 'faster',
+                  'fast', 'medium', 'slow', 'slower', 'veryslow')
+_VIDEO_DEVICES = ('cpu', 'cuda', 'qsv', 'videotoolbox', 'vaapi', 'auto')
+_IMAGE_FORMATS = ('jpg', 'jpeg', 'png', 'webp', 'tiff', 'bmp')
+
+
+@lru_cache(maxsize=64)
+def _cached_glob(pattern: str) -> Tuple[str, ...]:
+    """Expand a wildcard pattern, remembering the result for repeated patterns"""
+    return tuple(glob(pattern))
+
+
+def _existing_files(paths: List[str]) -> List[str]:
+    """
+    Keep the paths that exist, listing each parent directory once with
+    os.scandir instead of stat-ing every file
+
+    Args:
+        paths: File paths to check
+
+    Returns:
+        The existing paths, in their original order
+    """
+    listings = {}
+    existing = []
+    for path in paths:
+        directory, name = os.path.split(path)
+        directory = directory or '.'
+        if directory not in listings:
+            try:
+                with os.scandir(directory) as entries:
+                    listings[directory] = {entry.name for entry in entries}
+            except OSError:
+                listings[directory] = set()
+        # Names can differ only in case on case-insensitive filesystems
+        if name in listings[directory] or os.path.exists(path):
+            existing.append(path)
+    return existing
+
+
+def _is_up_to_date(input_path: Path, output_path: Path) -> bool:
+    """Whether output_path is a non-empty file at least as new as input_path"""
+    if output_path == input_path:
+        return False
+    try:
+        output_stat = output_path.stat()
+        return output_stat.st_size > 0 and output_stat.st_mtime >= input_path.stat().st_mtime
+    except OSError:
+        return False
+
+
+def _ffmpeg_threads_per_invocation(n_workers: int) -> int:
+    """Split the CPU cores evenly between concurrently running encodes"""
+    return max(1, (os.cpu_count() or n_workers) // n_workers)
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+# Image converter reused by every task a worker process runs
+_worker_image_converter = None
+
+
+def _convert_one(task: Tuple[str, str, Dict]) -> bool:
+    """Convert one image inside a worker process"""
+    global _worker_image_converter
+    if _worker_image_converter is None:
+        from image_converter import ImageConverter
+        _worker_image_converter = ImageConverter()
+    input_path, output_path, options = task
+    return bool(_worker_image_converter.convert(input_path, output_path, **options))
 
 
 class MediaConverterCLI:
     """Main CLI interface for the media converter tool"""
 
+    # Per-file status lines are written out in blocks of this many files
+    # when stdout is a pipe or file rather than a terminal
+    OUTPUT_FLUSH_FILES = 32
+
     def __init__(self):
-        self.video_converter = VideoConverter()
-        self.image_converter = ImageConverter()
+        self._output = None
+        self._reported = 0
+
+    @cached_property
+    def video_converter(self):
+        """Video converter, created on first use"""
+        from video_converter import VideoConverter
+        return VideoConverter()
+
+    @cached_property
+    def image_converter(self):
+        """Image converter, created on first use"""
+        from image_converter import ImageConverter
+        return ImageConverter()
+
+    @cached_property
+    def parser(self) -> argparse.ArgumentParser:
+        """Argument parser, built once and reused by every run() call"""
+        return self.setup_parser()
 
     def setup_parser(self) -> argparse.ArgumentParser:
         """Setup command line argument parser"""
@@ -63,32 +173,44 @@ Examples:
 
     def _setup_video_parser(self, parser: argparse.ArgumentParser):
         """Setup video-specific arguments"""
-        parser.add_argument('input', help='Input video file(s)')
+        parser.add_argument('input', nargs='+', help='Input video file(s)')
         parser.add_argument('-o', '--output', help='Output file path')
-        parser.add_argument('-f', '--format', choices=['mp4', 'avi', 'mkv', 'webm', 'mov'],
+        parser.add_argument('-f', '--format', choices=_VIDEO_FORMATS,
                           default='mp4', help='Output video format')
-        parser.add_argument('-q', '--quality', choices=['low', 'medium', 'high', 'lossless'],
+        parser.add_argument('-q', '--quality', choices=_VIDEO_QUALITIES,
                           default='medium', help='Compression quality')
         parser.add_argument('-r', '--resolution', help='Output resolution (e.g., 1920x1080, 1280x720)')
         parser.add_argument('-b', '--bitrate', help='Video bitrate (e.g., 2M, 1000k)')
+        parser.add_argument('--two-pass', action='store_true',
+                          help='Two-pass encode to hit --bitrate (CPU only; analysis is cached)')
         parser.add_argument('--fps', type=int, help='Frame rate')
         parser.add_argument('--compress', action='store_true', help='Enable compression')
         parser.add_argument('--start', help='Start time for clipping (HH:MM:SS)')
         parser.add_argument('--duration', help='Duration for clipping (HH:MM:SS)')
-        parser.add_argument('--audio-codec', choices=['aac', 'mp3', 'opus', 'none'],
+        parser.add_argument('--audio-codec', choices=_AUDIO_CODECS,
                           help='Audio codec (none to remove audio)')
-        parser.add_argument('--video-codec', choices=['h264', 'h265', 'vp9', 'av1'],
+        parser.add_argument('--video-codec', choices=_VIDEO_CODECS,
                           help='Video codec')
-        parser.add_argument('--preset', choices=['ultrafast', 'superfast', 'veryfast', 'faster',
-                          'fast', 'medium', 'slow', 'slower', 'veryslow'],
+        parser.add_argument('--preset', choices=_VIDEO_PRESETS,
                           default='medium', help='Encoding preset')
         parser.add_argument('--batch', action='store_true', help='Batch process multiple files')
+        parser.add_argument('--one-process', action='store_true',
+                          help='Encode all inputs in a single FFmpeg process (saves per-file startup)')
+        parser.add_argument('--concat', action='store_true',
+                          help='Join all inputs into one output file (same codec/resolution)')
+        parser.add_argument('--device', choices=_VIDEO_DEVICES, default='cpu',
+                          help='Encode on the CPU or a hardware encoder: cuda (NVIDIA NVENC), '
+                               'qsv (Intel Quick Sync), videotoolbox (macOS), vaapi (Linux), '
+                               'or auto (first one FFmpeg supports)')
+        parser.add_argument('--threads', type=_positive_int,
+                          help='FFmpeg threads per encode (default: CPU cores split between '
+                               'concurrent encodes, or $MEDIA_CONVERTER_FFMPEG_THREADS)')
 
     def _setup_image_parser(self, parser: argparse.ArgumentParser):
         """Setup image-specific arguments"""
         parser.add_argument('input', nargs='+', help='Input image file(s) or pattern')
         parser.add_argument('-o', '--output', help='Output file/directory path')
-        parser.add_argument('-f', '--format', choices=['jpg', 'jpeg', 'png', 'webp', 'tiff', 'bmp'],
+        parser.add_argument('-f', '--format', choices=_IMAGE_FORMATS,
                           help='Output image format')
         parser.add_argument('-q', '--quality', type=int, default=85,
                           help='JPEG/WebP quality (1-100)')
@@ -99,10 +221,12 @@ Examples:
         parser.add_argument('--strip-metadata', action='store_true', help='Remove EXIF data')
         parser.add_argument('--watermark', help='Add watermark image')
         parser.add_argument('--batch', action='store_true', help='Batch process multiple files')
+        parser.add_argument('--force', action='store_true',
+                          help='Convert even when the output is newer than the input')
 
     def run(self, args: List[str] = None) -> int:
         """Main entry point"""
-        parser = self.setup_parser()
+        parser = self.parser
         parsed_args = parser.parse_args(args)
 
         if not parsed_args.media_type:
@@ -125,34 +249,41 @@ Examples:
 
     def _handle_video(self, args) -> int:
         """Handle video conversion"""
-        input_path = Path(args.input)
+        input_paths = [Path(p) for p in args.input]
 
-        if not input_path.exists():
-            print(f"Error: Input file '{args.input}' not found")
-            return 1
-
-        # Determine output path
-        if args.output:
-            output_path = Path(args.output)
-        else:
-            output_path = input_path.with_suffix(f'.{args.format}')
-            if output_path == input_path:
-                output_path = input_path.with_stem(f"{input_path.stem}_converted")
+        for input_path in input_paths:
+            if not input_path.exists():
+                print(f"Error: Input file '{input_path}' not found")
+                return 1
 
-        print(f"Converting video: {input_path} -> {output_path}")
+        # Determine output paths; with several inputs --output is a directory
+        output_paths = []
+        for input_path in input_paths:
+            if args.output and len(input_paths) == 1:
+                output_path = Path(args.output)
+            else:
+                output_path = input_path.with_suffix(f'.{args.format}')
+                if args.output:
+                    output_path = Path(args.output) / output_path.name
+                if output_path == input_path:
+                    output_path = input_path.with_stem(f"{input_path.stem}_converted")
+            output_paths.append(output_path)
 
         # Build conversion options
         options = {
             'format': args.format,
             'quality': args.quality,
             'compress': args.compress,
-            'preset': args.preset
+            'preset': args.preset,
+            'device': args.device
         }
 
         if args.resolution:
             options['resolution'] = args.resolution
         if args.bitrate:
             options['bitrate'] = args.bitrate
+        if args.two_pass:
+            options['two_pass'] = True
         if args.fps:
             options['fps'] = args.fps
         if args.start:
@@ -164,6 +295,56 @@ Examples:
         if args.video_codec:
             options['video_codec'] = args.video_codec
 
+        joining = args.concat and len(input_paths) > 1
+
+        # Bound FFmpeg's thread pool so concurrent encodes don't oversubscribe the CPU
+        threads = args.threads
+        env_threads = os.environ.get('MEDIA_CONVERTER_FFMPEG_THREADS')
+        if threads is None and env_threads:
+            try:
+                threads = _positive_int(env_threads)
+            except argparse.ArgumentTypeError as e:
+                print(f"Warning: ignoring MEDIA_CONVERTER_FFMPEG_THREADS ({e})")
+        encodes = len(input_paths) if args.one_process and not joining else 1
+        options['threads'] = threads or _ffmpeg_threads_per_invocation(encodes)
+
+        if joining:
+            # One output for all inputs; --output names the file rather than a directory
+            first = input_paths[0]
+            output_path = Path(args.output) if args.output else first.with_name(
+                f"{first.stem}_joined.{args.format}")
+            print(f"Joining {len(input_paths)} videos -> {output_path}")
+            if self.video_converter.concat([str(p) for p in input_paths], str(output_path), **options):
+                print(f"✓ Videos joined successfully: {output_path}")
+                return 0
+            print("✗ Video join failed")
+            return 1
+
+        if len(input_paths) > 1:
+            if args.one_process:
+                print(f"Converting {len(input_paths)} videos in one FFmpeg run")
+                results = self.video_converter.convert_batch(
+                    [str(p) for p in input_paths], [str(p) for p in output_paths], **options
+                )
+            else:
+                results = {}
+                for input_path, output_path in zip(input_paths, output_paths):
+                    print(f"Converting video: {input_path} -> {output_path}")
+                    results[str(input_path)] = self.video_converter.convert(
+                        str(input_path), str(output_path), **options)
+            success_count = 0
+            for input_path, output_path in zip(input_paths, output_paths):
+                if results[str(input_path)]:
+                    print(f"  ✓ {input_path} -> {output_path}")
+                    success_count += 1
+                else:
+                    print(f"  ✗ {input_path}")
+            print(f"\nCompleted: {success_count}/{len(input_paths)} videos converted successfully")
+            return 0 if success_count == len(input_paths) else 1
+
+        input_path, output_path = input_paths[0], output_paths[0]
+        print(f"Converting video: {input_path} -> {output_path}")
+
         success = self.video_converter.convert(str(input_path), str(output_path), **options)
 
         if success:
@@ -176,82 +357,204 @@ Examples:
     def _handle_image(self, args) -> int:
         """Handle image conversion"""
         input_files = []
+        unchecked_files = []
+
+        # Reuse expansions only within this run; files may have changed since the last one
+        _cached_glob.cache_clear()
 
         # Expand input patterns
         for pattern in args.input:
             if '*' in pattern or '?' in pattern:
-                from glob import glob
-                input_files.extend(glob(pattern))
+                input_files.extend(_cached_glob(pattern))
             else:
                 input_files.append(pattern)
+                unchecked_files.append(pattern)
 
         if not input_files:
             print("Error: No input files found")
             return 1
 
-        # Filter existing files
-        existing_files = [f for f in input_files if Path(f).exists()]
+        # Drop unsupported file types by extension before they cost a stat or a Pillow open
+        allowed = set(self.image_converter.get_supported_formats()['input'])
+        supported_files = [f for f in input_files if os.path.splitext(f)[1].lower() in allowed]
+        unsupported = len(input_files) - len(supported_files)
+        if unsupported:
+            print(f"Skipping {unsupported} file(s) with unsupported image formats")
+            input_files = supported_files
+            unchecked_files = [f for f in unchecked_files if os.path.splitext(f)[1].lower() in allowed]
+
+        # Filter existing files; glob only returns paths it found on disk
+        missing = set(unchecked_files).difference(_existing_files(unchecked_files))
+        existing_files = [f for f in input_files if f not in missing]
         if not existing_files:
             print("Error: No valid input files found")
             return 1
 
         print(f"Processing {len(existing_files)} image(s)")
 
-        success_count = 0
+        # Interactive users see every line immediately; redirected output is batched
+        self._output = None if sys.stdout.isatty() else io.StringIO()
+        self._reported = 0
+        try:
+            results = self._convert_images(args, existing_files)
+        finally:
+            self._flush_output()
+            self._output = None
+
+        success_count = sum(results)
+
+        print(f"\nCompleted: {success_count}/{len(existing_files)} files processed successfully")
+        return 0 if success_count > 0 else 1
+
+    def _convert_images(self, args, existing_files: List[str]) -> List[bool]:
+        """Resolve output paths and convert the images, returning per-file success"""
+
+        tasks = []
+        skipped = 0
+        ensured_dirs = set()
+
+        # Conversion options are the same for every file, so build them once
+        options = {
+            'quality': args.quality,
+            'compress': args.compress,
+            'optimize': args.optimize,
+            'progressive': args.progressive,
+            'strip_metadata': args.strip_metadata
+        }
+
+        if args.format:
+            options['format'] = args.format
+        if args.resize:
+            options['resize'] = args.resize
+        if args.watermark:
+            options['watermark'] = args.watermark
+
+        # Output is directory or multiple files
+        output_root = Path(args.output) if args.output else None
+        output_is_dir = output_root is not None and (len(existing_files) > 1 or output_root.is_dir())
+        reencodes = args.compress or args.resize or args.quality != 85
+        # Without pixel or metadata changes, a same-format output is a plain file copy
+        passthrough = not (reencodes or args.optimize or args.progressive
+                           or args.strip_metadata or args.watermark)
+        copied = []
 
         for input_file in existing_files:
             input_path = Path(input_file)
 
             # Determine output path
-            if args.output:
-                output_path = Path(args.output)
-                if output_path.is_dir() or len(existing_files) > 1:
-                    # Output is directory or multiple files
-                    output_path = output_path / input_path.name
-                    if args.format:
-                        output_path = output_path.with_suffix(f'.{args.format}')
+            if output_is_dir:
+                output_path = output_root / input_path.name
+                if args.format:
+                    output_path = output_path.with_suffix(f'.{args.format}')
+            elif output_root is not None:
+                output_path = output_root
             else:
                 output_path = input_path
                 if args.format:
                     output_path = input_path.with_suffix(f'.{args.format}')
-                if output_path == input_path and (args.compress or args.resize or args.quality != 85):
+                if output_path == input_path and reencodes:
                     output_path = input_path.with_stem(f"{input_path.stem}_converted")
 
-            # Ensure output directory exists
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+            # Re-runs only convert files that changed since their output was written
+            if not args.force and _is_up_to_date(input_path, output_path):
+                self._emit(f"  ⏭ Skipped (up to date): {output_path}")
+                skipped += 1
+                continue
 
-            print(f"Processing: {input_path} -> {output_path}")
+            # Ensure output directory exists (once per directory)
+            parent = output_path.parent
+            if parent not in ensured_dirs:
+                parent.mkdir(parents=True, exist_ok=True)
+                ensured_dirs.add(parent)
 
-            # Build conversion options
-            options = {
-                'quality': args.quality,
-                'compress': args.compress,
-                'optimize': args.optimize,
-                'progressive': args.progressive,
-                'strip_metadata': args.strip_metadata
-            }
+            self._emit(f"Processing: {input_path} -> {output_path}")
 
-            if args.format:
-                options['format'] = args.format
-            if args.resize:
-                options['resize'] = args.resize
-            if args.watermark:
-                options['watermark'] = args.watermark
+            if passthrough and input_path.suffix.lower() == output_path.suffix.lower():
+                success = self._copy_image(input_path, output_path)
+                self._report_image(str(input_path), str(output_path), success)
+                copied.append(success)
+                continue
 
-            success = self.image_converter.convert(str(input_path), str(output_path), **options)
+            tasks.append((str(input_path), str(output_path), options))
 
-            if success:
-                print(f"  ✓ Converted successfully")
-                success_count += 1
-            else:
-                print(f"  ✗ Conversion failed")
+        self._flush_output()
 
-        print(f"\nCompleted: {success_count}/{len(existing_files)} files processed successfully")
-        return 0 if success_count > 0 else 1
+        # Files are independent, so spread them over all cores
+        if len(tasks) > 1:
+            results = asyncio.run(self._convert_images_async(tasks))
+        else:
+            results = []
+            for src, dst, task_options in tasks:
+                success = bool(self.image_converter.convert(src, dst, **task_options))
+                self._report_image(src, dst, success)
+                results.append(success)
+
+        return results + copied + [True] * skipped
+
+    def _copy_image(self, input_path: Path, output_path: Path) -> bool:
+        """Copy an image unchanged instead of decoding and re-encoding it"""
+        try:
+            # copyfile uses sendfile/copy_file_range, so the data stays in the kernel
+            shutil.copyfile(input_path, output_path)
+        except shutil.SameFileError:
+            pass
+        except OSError as e:
+            self._emit(f"  Error copying {input_path}: {e}")
+            return False
+        return True
+
+    def _emit(self, line: str):
+        """Print a status line, or buffer it while output is being batched"""
+        if self._output is None:
+            print(line)
+        else:
+            self._output.write(line + '\n')
+
+    def _flush_output(self):
+        """Write out any buffered status lines"""
+        if self._output is not None and self._output.tell():
+            sys.stdout.write(self._output.getvalue())
+            sys.stdout.flush()
+            self._output.seek(0)
+            self._output.truncate()
+
+    def _report_image(self, input_path: str, output_path: str, success: bool):
+        """Print the outcome of one image conversion"""
+        if success:
+            self._emit(f"  ✓ Converted successfully: {output_path}")
+        else:
+            self._emit(f"  ✗ Conversion failed: {input_path}")
+
+        self._reported += 1
+        if self._reported % self.OUTPUT_FLUSH_FILES == 0:
+            self._flush_output()
+
+    async def _convert_image_async(self, sem: asyncio.Semaphore, pool: ProcessPoolExecutor,
+                                   task: Tuple[str, str, Dict]) -> bool:
+        """Convert one image in the pool and report it as soon as it finishes"""
+        async with sem:
+            loop = asyncio.get_running_loop()
+            success = await loop.run_in_executor(pool, _convert_one, task)
+        self._report_image(task[0], task[1], success)
+        return success
+
+    async def _convert_images_async(self, tasks: List[Tuple[str, str, Dict]]) -> List[bool]:
+        """
+        Convert images concurrently in a shared process pool
+
+        The semaphore keeps only a couple of tasks queued per worker, so
+        results stream out while later files are still being converted.
+        """
+        workers = os.cpu_count() or 1
+        sem = asyncio.Semaphore(workers * 2)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return await asyncio.gather(*(self._convert_image_async(sem, pool, task) for task in tasks))
 
 
 def main():
     """Main entry point"""
+    # The converters log the FFmpeg commands they run; show them like the other status lines
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
     cli = MediaConverterCLI()
     return cli.run()
 
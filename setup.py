@@ -4,18 +4,23 @@ Setup and Installation Utility for Media Converter CLI Tool
 Handles dependency installation, system checks, and initial configuration
 """
 
+import argparse
 import os
 import sys
 import subprocess
-import shutil
 import platform
+import tempfile
 from pathlib import Path
 
+from ffmpeg_utils import find_ffmpeg, ffmpeg_version
+
 
 class MediaConverterSetup:
     """Setup utility for the Media Converter tool"""
 
-    def __init__(self):
+    def __init__(self, pillow_simd: bool = False):
+        # Opt-in: replacing Pillow needs a compiler and rebuilds it from source
+        self.pillow_simd = pillow_simd or os.environ.get('MEDIA_CONVERTER_PILLOW_SIMD') == '1'
         self.system = platform.system().lower()
         self.python_version = sys.version_info
         self.script_dir = Path(__file__).parent
@@ -35,8 +40,8 @@ class MediaConverterSetup:
         """Check if Python version is compatible"""
         print("Checking Python version...")
 
-        if self.python_version < (3, 7):
-            print("❌ Python 3.7 or higher is required")
+        if self.python_version < (3, 11):
+            print("❌ Python 3.11 or higher is required")
             print(f"   Current version: {sys.version}")
             return False
 
@@ -73,7 +78,6 @@ class MediaConverterSetup:
 
             if result.returncode == 0:
                 print("✅ Python dependencies installed successfully")
-                return True
             else:
                 print("❌ Failed to install Python dependencies")
                 print(f"Error: {result.stderr}")
@@ -83,25 +87,73 @@ class MediaConverterSetup:
             print(f"❌ Error installing dependencies: {e}")
             return False
 
+        if self.pillow_simd:
+            self.install_pillow_simd()
+        return True
+
+    def install_pillow_simd(self):
+        """Replace Pillow with the pillow-simd drop-in build on x86_64
+
+        pillow-simd uses SSE4/AVX2 for resize and color conversion. It is
+        built from source into a wheel first; Pillow is only uninstalled
+        once that wheel exists, and is reinstalled if swapping fails.
+
+        Returns:
+            True if pillow-simd is installed
+        """
+        if platform.machine().lower() not in ('x86_64', 'amd64'):
+            print(f"Skipping pillow-simd on {platform.machine()} (x86_64 only), using Pillow")
+            return False
+
+        print("Building pillow-simd (SIMD build of Pillow)...")
+        pip = [sys.executable, "-m", "pip"]
+
+        try:
+            with tempfile.TemporaryDirectory() as wheel_dir:
+                # Same minimum version as the Pillow requirement
+                result = subprocess.run(pip + ["wheel", "--no-deps", "-w", wheel_dir, "pillow-simd>=10.0.0"],
+                                        capture_output=True, text=True)
+                wheels = list(Path(wheel_dir).glob("*.whl"))
+                if result.returncode != 0 or not wheels:
+                    print("⚠️  pillow-simd>=10.0.0 could not be built, keeping Pillow")
+                    return False
+
+                result = subprocess.run(pip + ["uninstall", "-y", "Pillow"], capture_output=True, text=True)
+                if result.returncode != 0:
+                    print(f"⚠️  Could not uninstall Pillow, keeping it: {result.stderr.strip()}")
+                    return False
+
+                result = subprocess.run(pip + ["install", "--no-index", "--no-deps", str(wheels[0])],
+                                        capture_output=True, text=True)
+                if result.returncode == 0:
+                    print("✅ pillow-simd installed successfully")
+                    return True
+                print(f"⚠️  pillow-simd install failed, reinstalling Pillow: {result.stderr.strip()}")
+
+        except Exception as e:
+            print(f"⚠️  Could not install pillow-simd: {e}")
+
+        # Pillow may be gone at this point, so make sure it comes back
+        result = subprocess.run(pip + ["install", "Pillow>=10.0.0"], capture_output=True, text=True)
+        if result.returncode != 0:
+            print("❌ Could not reinstall Pillow; run: pip install 'Pillow>=10.0.0'")
+        return False
+
     def check_ffmpeg(self):
         """Check if FFmpeg is installed"""
         print("Checking FFmpeg installation...")
 
-        ffmpeg_path = shutil.which('ffmpeg')
+        ffmpeg_path = find_ffmpeg()
         if ffmpeg_path:
             print(f"✅ FFmpeg found at: {ffmpeg_path}")
 
-            # Check FFmpeg version
-            try:
-                result = subprocess.run(['ffmpeg', '-version'],
-                                      capture_output=True, text=True)
-                if result.returncode == 0:
-                    version_line = result.stdout.split('\n')[0]
-                    print(f"   {version_line}")
-                    return True
-            except Exception as e:
-                print(f"   Warning: Could not get FFmpeg version: {e}")
-                return True
+            # Check FFmpeg version (probed once and shared with the converters)
+            version_line = ffmpeg_version()
+            if version_line:
+                print(f"   {version_line}")
+            else:
+                print("   Warning: Could not get FFmpeg version")
+            return True
         else:
             print("❌ FFmpeg not found")
             return False
@@ -143,8 +195,10 @@ class MediaConverterSetup:
 
         # Test PIL/Pillow
         try:
+            import PIL
             from PIL import Image
-            print("✅ Pillow (PIL) import successful")
+            simd = " (SIMD)" if '.post' in PIL.__version__ else ""
+            print(f"✅ Pillow (PIL) {PIL.__version__}{simd} import successful")
         except ImportError as e:
             print(f"❌ Pillow (PIL) import failed: {e}")
             return False
@@ -312,8 +366,14 @@ python3 media_converter.py "$@"
 
 def main():
     """Main setup function"""
+    parser = argparse.ArgumentParser(description="Set up the Media Converter CLI Tool")
+    parser.add_argument('--pillow-simd', action='store_true',
+                        help='Replace Pillow with pillow-simd on x86_64 (builds from source; '
+                             'or set MEDIA_CONVERTER_PILLOW_SIMD=1)')
+    args = parser.parse_args()
+
     try:
-        setup = MediaConverterSetup()
+        setup = MediaConverterSetup(pillow_simd=args.pillow_simd)
         success = setup.run_setup()
 
         if success:
@@ -1,231 +1,592 @@
 #!/usr/bin/env python3
 """
-Test script for Media Converter CLI Tool
+Test suite for Media Converter CLI Tool
 Simple verification that the installation is working correctly
+
+Run with: python -m pytest -n auto  (or python test_converter.py)
 """
 
-import sys
 import os
-from pathlib import Path
+import sys
+import time
+
+import pytest
 
-# Add the current directory to Python path
-sys.path.insert(0, str(Path(__file__).parent))
 
 def test_imports():
     """Test if all modules can be imported"""
-    print("Testing imports...")
+    from video_converter import VideoConverter
+    from image_converter import ImageConverter
+    from media_converter import MediaConverterCLI
 
-    try:
-        from video_converter import VideoConverter
-        from image_converter import ImageConverter
-        from media_converter import MediaConverterCLI
-        print("✅ All modules imported successfully")
-        return True
-    except ImportError as e:
-        print(f"❌ Import error: {e}")
-        return False
 
-def test_image_converter():
+def test_image_converter(img_converter):
     """Test basic image converter functionality"""
-    print("\nTesting Image Converter...")
-
-    try:
-        from image_converter import ImageConverter
-        converter = ImageConverter()
-
-        # Test supported formats
-        formats = converter.get_supported_formats()
-        if formats and 'input' in formats and 'output' in formats:
-            print("✅ Image converter: Supported formats retrieved")
-            print(f"   Input formats: {len(formats['input'])} types")
-            print(f"   Output formats: {len(formats['output'])} types")
-        else:
-            print("❌ Image converter: Could not retrieve supported formats")
-            return False
+    # Test supported formats
+    formats = img_converter.get_supported_formats()
+    assert formats and 'input' in formats and 'output' in formats
+    assert formats['input'] and formats['output']
 
-        # Test dependencies
-        if converter._check_dependencies():
-            print("✅ Image converter: Dependencies check passed")
-        else:
-            print("❌ Image converter: Dependencies check failed")
-            return False
+    # Test dependencies
+    assert img_converter._check_dependencies()
 
-        return True
+    backend = img_converter.get_backend_info()
+    assert backend['pillow']
 
-    except Exception as e:
-        print(f"❌ Image converter test failed: {e}")
-        return False
 
-def test_video_converter():
+def test_video_converter(vid_converter):
     """Test basic video converter functionality"""
-    print("\nTesting Video Converter...")
+    # Test supported formats
+    assert vid_converter.get_supported_formats()
 
-    try:
-        from video_converter import VideoConverter
-        converter = VideoConverter()
+    # FFmpeg is optional; without it video features are disabled, not broken
+    if not vid_converter._check_dependencies():
+        pytest.skip("FFmpeg not found (video features disabled)")
 
-        # Test supported formats
-        formats = converter.get_supported_formats()
-        if formats:
-            print(f"✅ Video converter: {len(formats)} supported formats")
-        else:
-            print("❌ Video converter: Could not retrieve supported formats")
-            return False
 
-        # Test FFmpeg availability
-        if converter._check_dependencies():
-            print("✅ Video converter: FFmpeg is available")
-        else:
-            print("⚠️  Video converter: FFmpeg not found (video features disabled)")
-            print("   This is normal if FFmpeg is not installed")
+def test_video_unknown_options_ignored(vid_converter, tmp_path):
+    """Options the video converter doesn't use are ignored, not raised"""
+    from video_converter import _encode_job
+    job = _encode_job({'quality': 'high', 'watermark': 'x', 'bogus': 1})
+    assert job.quality == 'high'
 
-        return True
+    missing = str(tmp_path / "missing.mp4")
+    output = str(tmp_path / "out.mp4")
+    assert vid_converter.convert(missing, output, bogus=1) is False
+    assert vid_converter.convert_batch([missing], [output], bogus=1) == {missing: False}
 
-    except Exception as e:
-        print(f"❌ Video converter test failed: {e}")
-        return False
 
-def test_cli_interface():
+def test_cli_interface(capsys):
     """Test CLI interface"""
-    print("\nTesting CLI Interface...")
-
-    try:
-        from media_converter import MediaConverterCLI
-        cli = MediaConverterCLI()
-
-        # Test argument parser creation
-        parser = cli.setup_parser()
-        if parser:
-            print("✅ CLI: Argument parser created successfully")
-        else:
-            print("❌ CLI: Could not create argument parser")
-            return False
-
-        # Test help output (should not raise exceptions)
-        help_args = ['--help']
-        try:
-            parser.parse_args(help_args)
-        except SystemExit:
-            # This is expected for --help
-            print("✅ CLI: Help system works correctly")
-        except Exception as e:
-            print(f"❌ CLI: Help system error: {e}")
-            return False
-
-        return True
-
-    except Exception as e:
-        print(f"❌ CLI test failed: {e}")
-        return False
+    from media_converter import MediaConverterCLI
+    cli = MediaConverterCLI()
 
-def create_test_image():
-    """Create a simple test image"""
-    try:
-        from PIL import Image
+    # Test argument parser creation
+    parser = cli.setup_parser()
+    assert parser
 
-        # Create a simple test image
-        test_image_path = "test_image.jpg"
-        img = Image.new('RGB', (100, 100), color='red')
-        img.save(test_image_path, 'JPEG')
+    # Test help output (exits cleanly after printing usage)
+    with pytest.raises(SystemExit) as exc_info:
+        parser.parse_args(['--help'])
+    assert exc_info.value.code == 0
+    assert 'usage' in capsys.readouterr().out
 
-        print(f"✅ Created test image: {test_image_path}")
-        return test_image_path
 
-    except Exception as e:
-        print(f"❌ Could not create test image: {e}")
-        return None
-
-def test_image_conversion():
+def test_image_conversion(img_converter, test_image):
     """Test actual image conversion"""
-    print("\nTesting Image Conversion...")
-
-    # Create test image
-    test_image = create_test_image()
-    if not test_image:
-        return False
-
-    try:
-        from image_converter import ImageConverter
-        converter = ImageConverter()
-
-        # Test conversion
-        output_path = "test_image_converted.png"
-        success = converter.convert(
-            test_image,
-            output_path,
-            format='png',
-            quality=85
-        )
-
-        if success and Path(output_path).exists():
-            print("✅ Image conversion: Successfully converted JPG to PNG")
-
-            # Clean up
-            os.remove(test_image)
-            os.remove(output_path)
-            print("✅ Test files cleaned up")
-
-            return True
-        else:
-            print("❌ Image conversion failed")
-            return False
-
-    except Exception as e:
-        print(f"❌ Image conversion test failed: {e}")
-
-        # Clean up on error
-        for file in [test_image, "test_image_converted.png"]:
-            if file and Path(file).exists():
-                try:
-                    os.remove(file)
-                except:
-                    pass
-
-        return False
-
-def main():
-    """Main test function"""
-    print("Media Converter CLI Tool - Test Suite")
-    print("=" * 50)
-
-    tests_passed = 0
-    total_tests = 5
-
-    # Run tests
-    if test_imports():
-        tests_passed += 1
-
-    if test_image_converter():
-        tests_passed += 1
-
-    if test_video_converter():
-        tests_passed += 1
-
-    if test_cli_interface():
-        tests_passed += 1
-
-    if test_image_conversion():
-        tests_passed += 1
+    output_path = test_image.with_name("test_image_converted.png")
+    result = img_converter.convert(
+        str(test_image),
+        str(output_path),
+        format='png',
+        quality=85
+    )
+
+    assert result, "JPG to PNG conversion failed"
+    assert output_path.exists()
+
+    # Result reports output size and dimensions
+    assert result.nbytes == output_path.stat().st_size
+    assert (result.width, result.height) == (100, 100)
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("50%", (100, 50)),
+    ("800x600", (800, 600)),
+    ("800x", (800, 100)),
+    ("x600", (200, 600)),
+    ("x", (200, 100)),
+    ("640", (640, 320)),
+])
+def test_parse_resize(img_converter, spec, expected):
+    """Resize specs: percentage, explicit or partial dimensions, single width"""
+    assert img_converter._parse_resize(spec, (200, 100)) == expected
+
+
+@pytest.mark.parametrize("spec", ["", "abc", "50%%", "-5", "800x600x2", "1.5x2"])
+def test_parse_resize_invalid(img_converter, spec):
+    """Malformed resize specs are rejected"""
+    with pytest.raises(ValueError):
+        img_converter._parse_resize(spec, (200, 100))
+
+
+def test_compress_without_reencode(img_converter, test_image):
+    """Compressing a JPEG at or above its own quality doesn't re-encode it"""
+    from PIL import Image
+
+    with Image.open(test_image) as img:
+        assert img_converter._estimate_jpeg_quality(img) == 75  # Pillow's default
+
+    output_path = test_image.with_name("compressed.jpg")
+    assert img_converter.compress(str(test_image), str(output_path), quality=90)
+    assert output_path.stat().st_size <= test_image.stat().st_size
+    with Image.open(test_image) as original, Image.open(output_path) as compressed:
+        assert original.tobytes() == compressed.tobytes()
+
+    # Below the source quality it is a real re-encode
+    output_path = test_image.with_name("recompressed.jpg")
+    assert img_converter.compress(str(test_image), str(output_path), quality=30)
+    with Image.open(output_path) as compressed:
+        assert img_converter._estimate_jpeg_quality(compressed) == 30
+
+
+def test_same_format_passthrough(img_converter, test_image):
+    """A same-format conversion with no changes copies the file"""
+    output_path = test_image.with_name("copy.jpg")
+    assert img_converter.convert(str(test_image), str(output_path))
+    assert output_path.read_bytes() == test_image.read_bytes()
+
+
+def test_cli_same_format_copy(test_image):
+    """The CLI copies same-format images when nothing is re-encoded"""
+    from media_converter import MediaConverterCLI
+    output_path = test_image.with_name("cli_copy.jpg")
+    assert MediaConverterCLI().run(['image', str(test_image), '-o', str(output_path)]) == 0
+    assert output_path.read_bytes() == test_image.read_bytes()
+
+
+def test_image_up_to_date_skip(test_image, capsys):
+    """Outputs newer than their input are skipped unless --force is given"""
+    from media_converter import MediaConverterCLI
+    output_path = test_image.with_name("out.png")
+    args = ['image', str(test_image), '-o', str(output_path)]
+
+    assert MediaConverterCLI().run(args) == 0
+    assert "Converted successfully" in capsys.readouterr().out
+
+    assert MediaConverterCLI().run(args) == 0
+    assert "Skipped (up to date)" in capsys.readouterr().out
+
+    assert MediaConverterCLI().run(args + ['--force']) == 0
+    assert "Converted successfully" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("options, problem", [
+    ({}, None),
+    ({'resolution': '1280X720', 'start_time': '00:01:30', 'duration': '2.5', 'fps': 30}, None),
+    ({'resolution': '1920x1080p'}, "resolution"),
+    ({'video_codec': 'mpeg2'}, "video codec"),
+    ({'quality': 'ultra'}, "quality"),
+    ({'video_codec': 'av1', 'quality': 'lossless'}, "AV1"),
+    ({'audio_codec': 'flac'}, "audio codec"),
+    ({'fps': 0}, "frame rate"),
+    ({'start_time': '1:2:3:4'}, "start time"),
+    ({'duration': 'ten'}, "duration"),
+    ({'device': 'gpu'}, "device"),
+])
+def test_video_validate(vid_converter, options, problem):
+    """Bad encode options are caught before FFmpeg starts"""
+    from video_converter import _encode_job
+    error = vid_converter._validate(_encode_job(options))
+    if problem is None:
+        assert error is None
+    else:
+        assert problem in error
+
 
-    # Results
-    print("\n" + "=" * 50)
-    print(f"Test Results: {tests_passed}/{total_tests} tests passed")
+class _RecordingProgress:
+    """Stands in for _ProgressLine, keeping every timestamp it is given"""
 
-    if tests_passed == total_tests:
-        print("🎉 All tests passed! The Media Converter is ready to use.")
-        print("\nNext steps:")
-        print("1. Try: python media_converter.py --help")
-        print("2. Run: python examples.py")
-        print("3. Install FFmpeg for video conversion features")
+    def __init__(self):
+        self.times = []
+
+    def update(self, out_time: bytes):
+        self.times.append(out_time)
+
+
+_FAKE_FFMPEG = (
+    "import sys\n"
+    "sys.stderr.write('decode error\\n')\n"
+    "for t in range(3):\n"
+    "    print(f'frame={t}\\nout_time=00:00:0{t}.000000\\nprogress=continue', flush=True)\n"
+)
+
+
+@pytest.mark.parametrize("waiter", ["_wait_with_progress", "_wait_with_readline"])
+def test_video_progress_parsing(vid_converter, waiter):
+    """out_time values are read from -progress output; stderr is kept for errors"""
+    import subprocess
+    process = subprocess.Popen([sys.executable, '-c', _FAKE_FFMPEG],
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    progress = _RecordingProgress()
+    stderr_tail = getattr(vid_converter, waiter)(process, progress)
+
+    assert process.returncode == 0
+    assert progress.times and progress.times[-1] == b'00:00:02.000000'
+    assert all(t.startswith(b'00:00:0') for t in progress.times)
+    assert stderr_tail == 'decode error\n'
+
+
+def test_video_progress_throttle(monkeypatch, capsys):
+    """Progress is shown at most every 0.25 s, and the last value always"""
+    import video_converter
+    clock = [1.0, 1.1, 1.2, 1.5, 1.6]
+    monkeypatch.setattr(video_converter.time, 'monotonic',
+                        lambda: clock.pop(0) if len(clock) > 1 else clock[0])
+
+    progress = video_converter._ProgressLine()
+    for out_time in (b'1', b'2', b'3', b'4', b'5'):
+        progress.update(out_time)
+    progress.finish()
+
+    # Not a terminal under pytest, so each update is a whole line
+    assert capsys.readouterr().out.splitlines() == ['Progress: 1', 'Progress: 4', 'Progress: 5']
+
+
+@pytest.mark.parametrize("fmt", ["jpg", "png", "webp"])
+@pytest.mark.parametrize("resize", [None, "50%"])
+def test_strip_metadata(img_converter, tmp_path, fmt, resize):
+    """strip_metadata drops EXIF, ICC profile and comment, with or without other changes"""
+    from PIL import Image, ImageCms
+
+    exif = Image.Exif()
+    exif[0x010E] = "secret description"  # ImageDescription
+    icc = ImageCms.ImageCmsProfile(ImageCms.createProfile('sRGB')).tobytes()
+    source = tmp_path / "tagged.jpg"
+    Image.new('RGB', (64, 64), color='red').save(
+        source, 'JPEG', exif=exif.tobytes(), icc_profile=icc, comment=b'secret comment')
+
+    output_path = tmp_path / f"stripped.{fmt}"
+    assert img_converter.convert(str(source), str(output_path), strip_metadata=True, resize=resize)
+    with Image.open(output_path) as img:
+        for key in ('exif', 'icc_profile', 'comment'):
+            assert key not in img.info
+        assert 0x010E not in img.getexif()
+
+
+def _write_stats(cmd):
+    """Write the stats file a first pass of cmd would leave"""
+    from pathlib import Path
+    if '-passlogfile' in cmd:
+        Path(cmd[cmd.index('-passlogfile') + 1] + '-0.log').write_text('stats')
+
+
+def test_two_pass_reuses_first_pass(stub_converter, ffmpeg_stub, tmp_path, monkeypatch):
+    """One analysis serves encodes of an input at any bitrate"""
+    from video_converter import _encode_job
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / "cache"))
+    source = tmp_path / "in.mp4"
+    source.write_bytes(b'video')
+    ffmpeg_stub.on_run = _write_stats
+
+    second_pass = stub_converter._first_pass(str(source), _encode_job({'two_pass': True, 'bitrate': '1M'}))
+    passlog = second_pass[-1]
+    assert second_pass == ['-pass', '2', '-passlogfile', passlog]
+    assert len(ffmpeg_stub.commands) == 1
+    assert ffmpeg_stub.commands[0][-3:] == ['null', '-y', os.devnull]
+
+    # Stats moved into place from the private prefix, then the marker
+    cache_dir = stub_converter._passlog_dir()
+    assert sorted(p.name for p in cache_dir.iterdir()) == sorted(
+        [os.path.basename(passlog) + '-0.log', os.path.basename(passlog) + '.done'])
+
+    again = stub_converter._first_pass(str(source), _encode_job({'two_pass': True, 'bitrate': '4M'}))
+    assert again == second_pass
+    assert len(ffmpeg_stub.commands) == 1
+
+
+def test_two_pass_failed_first_pass(stub_converter, ffmpeg_stub, tmp_path, monkeypatch, capsys):
+    """A failed analysis leaves no stats or marker behind"""
+    from video_converter import _encode_job
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / "cache"))
+    source = tmp_path / "in.mp4"
+    source.write_bytes(b'video')
+    ffmpeg_stub.on_run = _write_stats
+    ffmpeg_stub.returncode = 1
+
+    assert stub_converter._first_pass(str(source), _encode_job({'two_pass': True, 'bitrate': '1M'})) is None
+    assert "FFmpeg error: stub error" in capsys.readouterr().out
+    assert not list(stub_converter._passlog_dir().iterdir())
+
+
+def test_prune_passlogs(vid_converter, tmp_path):
+    """Stats unused for a week and stale partial passes are deleted"""
+    import video_converter
+    old = time.time() - video_converter._PASSLOG_MAX_AGE - 60
+    names = ['old.done', 'old-0.log', 'old-0.log.mbtree', 'crashed.part-123-0.log',
+             'new.done', 'new-0.log']
+    for name in names:
+        (tmp_path / name).write_text('x')
+        if not name.startswith('new'):
+            os.utime(tmp_path / name, (old, old))
+
+    vid_converter._prune_passlogs(tmp_path)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['new-0.log', 'new.done']
+
+
+@pytest.mark.parametrize("options, crf", [
+    ({'bitrate': '1M'}, True),
+    ({'two_pass': True}, True),
+    ({'two_pass': True, 'bitrate': '1M'}, False),
+])
+def test_two_pass_drops_crf(stub_converter, options, crf):
+    """Only a two-pass encode with a target bitrate leaves out the CRF"""
+    from video_converter import _encode_job
+    assert ('-crf' in stub_converter._build_output_options(_encode_job(options))) == crf
+
+
+def test_batch_retries_unfinished_outputs(stub_converter, ffmpeg_stub, tmp_path, monkeypatch):
+    """After a failed combined run only outputs that are missing or cut short are redone"""
+    from pathlib import Path
+    inputs = [str(tmp_path / f"{name}.mp4") for name in ('done', 'short', 'missing')]
+    outputs = [str(tmp_path / "out" / f"{name}.mp4") for name in ('done', 'short', 'missing')]
+    for path in inputs:
+        Path(path).write_bytes(b'video')
+    Path(outputs[2]).parent.mkdir()
+    Path(outputs[2]).write_bytes(b'from an earlier run')
+
+    def failed_run(cmd):
+        Path(outputs[0]).write_bytes(b'whole')
+        Path(outputs[1]).write_bytes(b'cut')
+    ffmpeg_stub.on_run = failed_run
+    ffmpeg_stub.returncode = 1
+
+    # The stale output would pass as complete if it were kept
+    durations = dict.fromkeys(inputs + outputs, '6.0')
+    durations[outputs[1]] = '2.0'
+    stub_converter.ffprobe_path = 'ffprobe'
+    monkeypatch.setattr(stub_converter, 'get_video_info',
+                        lambda path: {'format': {'duration': durations[path]}})
+    retried = []
+    monkeypatch.setattr(stub_converter, 'convert',
+                        lambda input_path, output_path, **options: retried.append(input_path) or True)
+
+    results = stub_converter.convert_batch(inputs, outputs, progress=False)
+    assert len(ffmpeg_stub.commands) == 1
+    assert ffmpeg_stub.commands[0].count('-i') == 3
+    assert retried == inputs[1:]
+    assert results == dict.fromkeys(inputs, True)
+
+
+def test_concat_manifest(tmp_path, monkeypatch):
+    """Paths are absolute, quoted for the concat script and read via the file protocol"""
+    from video_converter import _concat_manifest
+    monkeypatch.chdir(tmp_path)
+    assert _concat_manifest(["/videos/it's.mp4", "part 2.mp4"]) == (
+        "file 'file:/videos/it'\\''s.mp4'\n"
+        f"file 'file:{tmp_path}/part 2.mp4'\n"
+    )
+
+
+def test_concat_command(stub_converter, ffmpeg_stub, tmp_path):
+    """concat() sends the file list on stdin rather than naming the inputs"""
+    from pathlib import Path
+    from video_converter import _CONCAT_INPUT, _concat_manifest
+    inputs = [str(tmp_path / f"part{i}.mp4") for i in range(3)]
+    for path in inputs:
+        Path(path).write_bytes(b'video')
+    output = str(tmp_path / "joined.mp4")
+    ffmpeg_stub.on_run = lambda cmd: Path(cmd[-1]).write_bytes(b'joined')
+
+    assert stub_converter.concat(inputs, output, two_pass=True)
+    cmd = ffmpeg_stub.commands[0]
+    assert len(ffmpeg_stub.commands) == 1
+    assert cmd[cmd.index('-f'):cmd.index('pipe:0') + 1] == list(_CONCAT_INPUT)
+    assert not set(inputs) & set(cmd)
+    assert cmd[-1] == output
+    assert ffmpeg_stub.inputs[0] == _concat_manifest(inputs)
+
+
+@pytest.fixture
+def chunk_converter(stub_converter, tmp_path, monkeypatch):
+    """stub_converter with a 60 s input, recording convert() calls instead of encoding"""
+    from pathlib import Path
+    source = tmp_path / "long.mp4"
+    source.write_bytes(b'video')
+    stub_converter.ffprobe_path = 'ffprobe'
+    monkeypatch.setattr(stub_converter, 'get_video_info', lambda path: {'format': {'duration': '60.0'}})
+
+    stub_converter.converted = []
+    def convert(input_path, output_path, **options):
+        stub_converter.converted.append((input_path, output_path, options))
+        Path(output_path).write_bytes(b'encoded')
         return True
-    else:
-        print("❌ Some tests failed. Please check the installation.")
-        print("\nTroubleshooting:")
-        print("1. Make sure all dependencies are installed: pip install -r requirements.txt")
-        print("2. Check Python version (3.7+ required)")
-        print("3. For video features, install FFmpeg")
-        return False
+    monkeypatch.setattr(stub_converter, 'convert', convert)
+    return stub_converter, str(source)
+
+
+@pytest.mark.parametrize("chunks, options", [
+    (1, {}),
+    (4, {'quality': 'lossless'}),
+    (4, {'two_pass': True, 'bitrate': '1M'}),
+    (4, {'start_time': '00:00:10'}),
+    (4, {'duration': '5'}),
+])
+def test_chunked_falls_back_to_convert(chunk_converter, ffmpeg_stub, tmp_path, chunks, options):
+    """Conversions that can't be split are handed to convert() unchanged"""
+    converter, source = chunk_converter
+    output = str(tmp_path / "out.mp4")
+    assert converter.convert_chunked(source, output, chunks=chunks, **options)
+    assert converter.converted == [(source, output, options)]
+    assert not ffmpeg_stub.commands
+
+
+def test_chunked_unknown_duration(chunk_converter, ffmpeg_stub, tmp_path, monkeypatch):
+    """Without a duration there are no split points"""
+    converter, source = chunk_converter
+    monkeypatch.setattr(converter, 'get_video_info', lambda path: None)
+    assert converter.convert_chunked(source, str(tmp_path / "out.mp4"), chunks=4)
+    assert len(converter.converted) == 1
+    assert not ffmpeg_stub.commands
+
+
+def test_chunked_split_failure(chunk_converter, ffmpeg_stub, tmp_path, capsys):
+    """A failed split falls back to converting the input in one piece"""
+    converter, source = chunk_converter
+    ffmpeg_stub.returncode = 1
+    assert converter.convert_chunked(source, str(tmp_path / "out.mp4"), chunks=4)
+    assert "Could not split the input" in capsys.readouterr().out
+    assert [input_path for input_path, _, _ in converter.converted] == [source]
+    assert len(ffmpeg_stub.commands) == 1
+
+
+def test_chunked_encode(chunk_converter, ffmpeg_stub, tmp_path):
+    """Chunks are encoded without audio, then joined with the original's audio"""
+    from pathlib import Path
+    from video_converter import _concat_manifest
+    converter, source = chunk_converter
+    output = str(tmp_path / "out.mp4")
+
+    def ffmpeg(cmd):
+        if 'segment' in cmd:
+            for i in range(4):
+                Path(cmd[-1] % i).write_bytes(b'chunk')
+        else:
+            Path(cmd[-1]).write_bytes(b'joined')
+    ffmpeg_stub.on_run = ffmpeg
+
+    assert converter.convert_chunked(source, output, chunks=4, threads=2)
+    split, join = ffmpeg_stub.commands
+    assert split[split.index('-segment_times') + 1] == '15.000,30.000,45.000'
+
+    encoded = [output_path for _, output_path, _ in converter.converted]
+    assert len(encoded) == 4
+    for _, _, options in converter.converted:
+        assert options == {'audio_codec': 'none', 'progress': False, 'threads': 2}
+    assert ffmpeg_stub.inputs[1] == _concat_manifest(encoded)
+    assert join[-1] == output and '1:a:0?' in join
+
+
+def test_existing_files(tmp_path, monkeypatch):
+    """Existing paths are kept in order; missing files and directories are dropped"""
+    from media_converter import _existing_files
+    (tmp_path / "a.jpg").write_bytes(b'')
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.jpg").write_bytes(b'')
+    monkeypatch.chdir(tmp_path)
+
+    paths = [str(tmp_path / "sub" / "b.jpg"), "a.jpg", str(tmp_path / "gone.jpg"),
+             str(tmp_path / "nodir" / "c.jpg"), str(tmp_path / "a.jpg")]
+    assert _existing_files(paths) == [paths[0], paths[1], paths[4]]
+
+
+class _FakeVipsImage:
+    """Enough of pyvips.Image for ImageConverter's vips backend"""
+
+    calls = []
+
+    def __init__(self, width, height):
+        self.width, self.height = width, height
+
+    @classmethod
+    def new_from_file(cls, path, **options):
+        cls.calls.append(('new_from_file', options))
+        return cls(100, 100)
+
+    @classmethod
+    def thumbnail(cls, path, width, height=None, size=None):
+        cls.calls.append(('thumbnail', (width, height, size)))
+        return cls(width, height)
+
+    def write_to_buffer(self, suffix, **options):
+        self.calls.append(('write_to_buffer', (suffix, options)))
+        return b'vips output'
+
+
+def test_vips_backend(img_converter, test_image, monkeypatch):
+    """backend='vips' resizes and encodes through libvips"""
+    import types
+    import image_converter
+    _FakeVipsImage.calls = []
+    monkeypatch.setattr(image_converter, 'pyvips', types.SimpleNamespace(Image=_FakeVipsImage))
+
+    output_path = test_image.with_name("vips.jpg")
+    result = img_converter.convert(str(test_image), str(output_path), backend='vips',
+                                   resize='50%', quality='high', strip_metadata=True)
+    assert result and (result.width, result.height) == (50, 50)
+    assert output_path.read_bytes() == b'vips output'
+    assert _FakeVipsImage.calls[1:] == [
+        ('thumbnail', (50, 50, 'force')),
+        ('write_to_buffer', ('.jpg', {'strip': True, 'Q': img_converter.quality_presets['high']})),
+    ]
+
+
+@pytest.mark.parametrize("vips, options, output_name", [
+    (False, {}, "out.png"),
+    (True, {'sharpen': True}, "out.png"),
+    (True, {}, "out.bmp"),
+])
+def test_vips_backend_fallback(img_converter, test_image, monkeypatch, capsys, vips, options, output_name):
+    """Without pyvips, with Pillow-only filters or formats, Pillow does the conversion"""
+    import types
+    import image_converter
+    _FakeVipsImage.calls = []
+    fake_pyvips = types.SimpleNamespace(Image=_FakeVipsImage) if vips else None
+    monkeypatch.setattr(image_converter, 'pyvips', fake_pyvips)
+
+    output_path = test_image.with_name(output_name)
+    assert img_converter.convert(str(test_image), str(output_path), backend='vips', **options)
+    assert not _FakeVipsImage.calls
+    assert output_path.read_bytes() != b'vips output'
+    assert ("pyvips not available, using Pillow" in capsys.readouterr().out) == (not vips)
+
+
+@pytest.mark.parametrize("device, encoders, hwaccels, backend", [
+    ('cpu', {'h264_nvenc'}, {'cuda'}, None),
+    ('auto', {'h264_nvenc', 'h264_qsv'}, {'cuda', 'qsv'}, 'nvenc'),
+    ('auto', {'h264_nvenc', 'h264_qsv'}, {'qsv'}, 'qsv'),
+    ('auto', set(), set(), None),
+    ('cuda', {'h264_nvenc'}, {'cuda'}, 'nvenc'),
+    ('cuda', {'h264_nvenc'}, set(), None),
+    ('vaapi', {'h264_vaapi'}, {'vaapi'}, 'vaapi'),
+])
+def test_hw_backend(stub_converter, monkeypatch, device, encoders, hwaccels, backend):
+    """A backend is used only if FFmpeg has both its encoder and its decoder"""
+    import video_converter
+    from video_converter import _encode_job
+    monkeypatch.setattr(video_converter, 'ffmpeg_encoders', lambda: frozenset(encoders))
+    monkeypatch.setattr(video_converter, 'ffmpeg_hwaccels', lambda: frozenset(hwaccels))
+    assert stub_converter._hw_backend(_encode_job({'device': device})) == backend
+
+
+def test_hw_backend_warns_once(stub_converter, capsys):
+    """A requested device that isn't available falls back to the CPU with one warning"""
+    from video_converter import _encode_job
+    job = _encode_job({'device': 'qsv', 'video_codec': 'h265'})
+    assert stub_converter._hw_backend(job) is None
+    assert stub_converter._hw_backend(job) is None
+    assert capsys.readouterr().out.count("no qsv h265 encoder, encoding on the CPU") == 1
+
+
+@pytest.mark.parametrize("device, hwaccel, encoder, scale", [
+    ('cuda', ['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda'], 'h264_nvenc', 'scale_cuda'),
+    ('videotoolbox', ['-hwaccel', 'videotoolbox'], 'h264_videotoolbox', 'scale'),
+    ('cpu', [], 'libx264', 'scale'),
+])
+def test_hw_command(stub_converter, monkeypatch, device, hwaccel, encoder, scale):
+    """Hardware encodes decode on the GPU and scale there when FFmpeg can"""
+    import video_converter
+    from video_converter import _encode_job
+    monkeypatch.setattr(video_converter, 'ffmpeg_encoders',
+                        lambda: frozenset({'h264_nvenc', 'h264_videotoolbox'}))
+    monkeypatch.setattr(video_converter, 'ffmpeg_hwaccels', lambda: frozenset({'cuda', 'videotoolbox'}))
+
+    job = _encode_job({'device': device, 'resolution': '1280x720'})
+    cmd = stub_converter._build_ffmpeg_command('in.mp4', 'out.mp4', job)
+    assert cmd[cmd.index('-loglevel') + 2:cmd.index('-i')] == hwaccel
+    assert cmd[cmd.index('-c:v') + 1] == encoder
+    assert cmd[cmd.index('-vf') + 1] == f'{scale}=1280:720'
+
 
 if __name__ == "__main__":
-    success = main()
-    sys.exit(0 if success else 1)
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -4,13 +4,145 @@ Video Converter Class
 Handles video conversion, compression, and manipulation using FFmpeg
 """
 
+import copy
+import dataclasses
+import hashlib
+import logging
 import os
+import re
+import selectors
+import shlex
 import subprocess
-import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Optional, Union, Tuple
+from typing import Dict, List, Optional, Union, Tuple
 import json
 
+from ffmpeg_utils import find_ffmpeg, find_ffprobe, ffmpeg_encoders, ffmpeg_hwaccels
+
+# How much of FFmpeg's stderr to keep for error messages
+_STDERR_TAIL_BYTES = 4096
+
+# Lines of FFmpeg's stderr kept while a thread drains it
+_STDERR_TAIL_LINES = 200
+
+# Minimum seconds between progress updates (FFmpeg reports twice a second or more)
+_PROGRESS_INTERVAL = 0.25
+
+# Cached first-pass stats unused for this many seconds are deleted
+_PASSLOG_MAX_AGE = 7 * 24 * 3600
+
+# Longest FFmpeg command line logged in full
+_LOG_COMMAND_CHARS = 240
+
+# Read a concat demuxer file list from stdin
+_CONCAT_INPUT = ('-f', 'concat', '-safe', '0', '-protocol_whitelist', 'file,pipe', '-i', 'pipe:0')
+
+# WIDTHxHEIGHT, e.g. 1920x1080
+_RESOLUTION_RE = re.compile(r'(\d+)[xX](\d+)')
+
+# FFmpeg time durations: [HH:]MM:SS[.frac] or seconds with an optional unit
+_TIME_RE = re.compile(r'(?:\d+:)?\d{1,2}:\d{1,2}(?:\.\d+)?|\d+(?:\.\d+)?(?:s|ms|us)?')
+
+# Software encoders by --video-codec name
+_VIDEO_ENCODERS = {
+    'h264': 'libx264',
+    'h265': 'libx265',
+    'vp9': 'libvpx-vp9',
+    'av1': 'libaom-av1'
+}
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class EncodeJob:
+    """Settings for one encode; built once from convert()'s keyword options"""
+    video_codec: str = 'h264'
+    quality: str = 'medium'
+    bitrate: Optional[str] = None
+    resolution: Optional[str] = None
+    fps: Optional[int] = None
+    audio_codec: str = 'aac'
+    preset: str = 'medium'
+    format: Optional[str] = 'mp4'
+    start_time: Optional[str] = None
+    duration: Optional[str] = None
+    device: Optional[str] = 'cpu'
+    threads: Optional[int] = None
+    two_pass: bool = False
+    progress: bool = True
+    compress: bool = False
+
+
+# Keyword options that are EncodeJob settings
+_ENCODE_JOB_FIELDS = frozenset(field.name for field in dataclasses.fields(EncodeJob))
+
+
+def _encode_job(options: Dict) -> EncodeJob:
+    """EncodeJob from convert()'s keyword options; keys it doesn't use are ignored"""
+    return EncodeJob(**{key: value for key, value in options.items() if key in _ENCODE_JOB_FIELDS})
+
+
+def _concat_manifest(paths: List[str]) -> str:
+    """File list for the concat demuxer"""
+    # Read from stdin, entries resolve against "pipe:", so name the file protocol explicitly.
+    # Quote each path for the concat script; a quote inside a path is written as '\''
+    return ''.join(
+        "file 'file:{}'\n".format(os.path.abspath(path).replace("'", "'\\''"))
+        for path in paths
+    )
+
+
+class _ProgressLine:
+    """One conversion's progress display, updated at most 4 times a second"""
+
+    def __init__(self):
+        # Redraw one line on a terminal; print whole lines into logs and pipes
+        self._tty = sys.stdout.isatty()
+        self._last_shown = 0.0
+        self._pending: Optional[bytes] = None
+        self._shown = False
+
+    def update(self, out_time: bytes):
+        """Show the output timestamp FFmpeg has reached, unless one was shown just now"""
+        now = time.monotonic()
+        if now - self._last_shown < _PROGRESS_INTERVAL:
+            self._pending = out_time  # Shown by finish() if nothing newer arrives
+            return
+        self._last_shown = now
+        self._pending = None
+        self._show(out_time)
+
+    def finish(self):
+        """Show the last timestamp and end the progress line"""
+        if self._pending is not None:
+            self._show(self._pending)
+        if self._tty and self._shown:
+            print()
+
+    def _show(self, out_time: bytes):
+        text = f"Progress: {out_time.decode('ascii', 'replace')}"
+        if self._tty:
+            print(f"\r{text}", end='', flush=True)
+        else:
+            print(text, flush=True)
+        self._shown = True
+
+
+def _format_command(cmd: List[str]) -> str:
+    """Shell-quoted command for logging, with the middle elided when it is long"""
+    line = shlex.join(cmd)
+    if len(line) > _LOG_COMMAND_CHARS:
+        half = _LOG_COMMAND_CHARS // 2
+        line = f"{line[:half]} ... {line[-half:]}"
+    return line
+
 
 class VideoConverter:
     """A class for converting and compressing videos using FFmpeg"""
@@ -27,13 +159,89 @@ class VideoConverter:
             'lossless': {'crf': 0, 'preset': 'veryslow'}
         }
 
+        # Audio encoders by --audio-codec name
+        self.audio_codecs = {
+            'aac': 'aac',
+            'mp3': 'libmp3lame',
+            'opus': 'libopus'
+        }
+
+        # Hardware encoders per backend; --device picks a backend by its decoder name
+        self.hw_codecs = {
+            'nvenc': {'h264': 'h264_nvenc', 'h265': 'hevc_nvenc', 'av1': 'av1_nvenc'},
+            'qsv': {'h264': 'h264_qsv', 'h265': 'hevc_qsv', 'vp9': 'vp9_qsv', 'av1': 'av1_qsv'},
+            'videotoolbox': {'h264': 'h264_videotoolbox', 'h265': 'hevc_videotoolbox'},
+            'vaapi': {'h264': 'h264_vaapi', 'h265': 'hevc_vaapi', 'vp9': 'vp9_vaapi', 'av1': 'av1_vaapi'}
+        }
+        self.hw_devices = {'cuda': 'nvenc', 'qsv': 'qsv', 'videotoolbox': 'videotoolbox', 'vaapi': 'vaapi'}
+
+        # -hwaccel name and the scale filter that keeps frames in GPU memory (None: scale on the CPU)
+        self.hw_decoders = {
+            'nvenc': ('cuda', 'scale_cuda'),
+            'qsv': ('qsv', 'scale_qsv'),
+            'videotoolbox': ('videotoolbox', None),
+            'vaapi': ('vaapi', 'scale_vaapi')
+        }
+
+        # x264-style preset names mapped to NVENC's p1-p7
+        self.nvenc_presets = {
+            'ultrafast': 'p1', 'superfast': 'p1', 'veryfast': 'p2', 'faster': 'p3',
+            'fast': 'p3', 'medium': 'p4', 'slow': 'p5', 'slower': 'p6', 'veryslow': 'p7'
+        }
+
+        # Devices already warned about falling back to the CPU
+        self._hw_warned = set()
+
+        # ffprobe results keyed by (path, size, mtime), so repeated probes of an unchanged file are free
+        self._probe_cache: 'OrderedDict[tuple, Dict]' = OrderedDict()
+        self._probe_cache_size = 256
+        self._probe_lock = threading.Lock()
+
+        # One lock per first-pass stats file, so parallel encodes of the same input analyse it once
+        self._passlog_locks: Dict[str, threading.Lock] = {}
+
+        # Thread pool behind convert_async, created on first use
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
     def _find_ffmpeg(self) -> Optional[str]:
         """Find FFmpeg executable"""
-        return shutil.which('ffmpeg')
+        return find_ffmpeg()
 
     def _find_ffprobe(self) -> Optional[str]:
         """Find FFprobe executable"""
-        return shutil.which('ffprobe')
+        return find_ffprobe()
+
+    def _hw_backend(self, job: EncodeJob) -> Optional[str]:
+        """
+        Pick the hardware backend for this conversion
+
+        Args:
+            job: Encode settings
+
+        Returns:
+            'nvenc', 'qsv', 'videotoolbox' or 'vaapi', or None to encode on the CPU
+        """
+        device = job.device or 'cpu'
+        if device == 'cpu':
+            return None
+
+        video_codec = job.video_codec
+        backends = list(self.hw_codecs) if device == 'auto' else [self.hw_devices.get(device)]
+
+        # The build must offer both the encoder and the matching hardware decoder
+        encoders, hwaccels = ffmpeg_encoders(), ffmpeg_hwaccels()
+        for backend in backends:
+            if backend is None:
+                continue
+            if (self.hw_codecs[backend].get(video_codec) in encoders
+                    and self.hw_decoders[backend][0] in hwaccels):
+                return backend
+
+        if device != 'auto' and device not in self._hw_warned:
+            self._hw_warned.add(device)
+            print(f"Warning: FFmpeg has no {device} {video_codec} encoder, encoding on the CPU")
+        return None
 
     def _check_dependencies(self) -> bool:
         """Check if required dependencies are available"""
@@ -45,12 +253,31 @@ class VideoConverter:
             return False
         return True
 
+    def clear_cache(self):
+        """Drop cached ffprobe results"""
+        with self._probe_lock:
+            self._probe_cache.clear()
+
     def get_video_info(self, input_path: str) -> Optional[Dict]:
         """Get video information using ffprobe"""
         if not self.ffprobe_path:
             print("Warning: ffprobe not available, cannot get video info")
             return None
 
+        # A changed file gets a new size or mtime, and so a new cache entry
+        try:
+            st = os.stat(input_path)
+        except OSError as e:
+            print(f"Error getting video info: {e}")
+            return None
+        cache_key = (os.path.realpath(input_path), st.st_size, st.st_mtime_ns)
+
+        with self._probe_lock:
+            cached = self._probe_cache.get(cache_key)
+            if cached is not None:
+                self._probe_cache.move_to_end(cache_key)
+                return copy.deepcopy(cached)
+
         try:
             cmd = [
                 self.ffprobe_path,
@@ -62,94 +289,218 @@ class VideoConverter:
             ]
 
             result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            return json.loads(result.stdout)
+            info = json.loads(result.stdout)
         except (subprocess.CalledProcessError, json.JSONDecodeError, FileNotFoundError) as e:
             print(f"Error getting video info: {e}")
             return None
 
+        with self._probe_lock:
+            self._probe_cache[cache_key] = info
+            while len(self._probe_cache) > self._probe_cache_size:
+                self._probe_cache.popitem(last=False)
+        return copy.deepcopy(info)
+
+    def _first_stream(self, input_path: str, codec_type: str) -> Optional[Dict]:
+        """First stream of the given type ('video' or 'audio') from the cached probe, if any"""
+        if not self.ffprobe_path:
+            return None
+
+        info = self.get_video_info(input_path)
+        for stream in (info or {}).get('streams', []):
+            if stream.get('codec_type') == codec_type:
+                return stream
+        return None
+
     def _parse_resolution(self, resolution: str) -> Tuple[int, int]:
         """Parse resolution string to width, height tuple"""
-        if 'x' in resolution.lower():
-            width, height = map(int, resolution.lower().split('x'))
-            return width, height
-        else:
+        match = _RESOLUTION_RE.fullmatch(resolution)
+        if not match:
             raise ValueError(f"Invalid resolution format: {resolution}")
+        return int(match.group(1)), int(match.group(2))
+
+    def _validate(self, job: EncodeJob) -> Optional[str]:
+        """
+        Check an encode's settings before any FFmpeg process is started
 
-    def _build_ffmpeg_command(self, input_path: str, output_path: str, **options) -> list:
+        A bad option would otherwise only surface as an FFmpeg error after
+        process startup and input probing, or as an exception halfway
+        through building the command.
+
+        Args:
+            job: Encode settings
+
+        Returns:
+            Description of the first problem found, or None if the settings are usable
+        """
+        if job.video_codec not in _VIDEO_ENCODERS:
+            return f"Unsupported video codec: {job.video_codec}"
+        if job.quality not in self.quality_presets:
+            return f"Unknown quality preset: {job.quality}"
+        if job.video_codec == 'av1' and job.quality == 'lossless':
+            return "Lossless quality is not available for AV1"
+        if job.audio_codec != 'none' and job.audio_codec not in self.audio_codecs:
+            return f"Unsupported audio codec: {job.audio_codec}"
+        if job.resolution and not _RESOLUTION_RE.fullmatch(job.resolution):
+            return f"Invalid resolution format: {job.resolution} (expected WIDTHxHEIGHT)"
+        if job.fps is not None and not (isinstance(job.fps, (int, float)) and job.fps > 0):
+            return f"Invalid frame rate: {job.fps}"
+        for name, value in (('start time', job.start_time), ('duration', job.duration)):
+            if value and not _TIME_RE.fullmatch(value):
+                return f"Invalid {name}: {value} (expected HH:MM:SS or seconds)"
+        if job.device not in (None, 'cpu', 'auto') and job.device not in self.hw_devices:
+            return f"Unknown device: {job.device}"
+        return None
+
+    def _build_ffmpeg_command(self, input_path: str, output_path: str, job: EncodeJob) -> list:
         """Build FFmpeg command based on options"""
         if not self.ffmpeg_path:
             raise RuntimeError("FFmpeg not available")
 
-        cmd = [self.ffmpeg_path, '-i', input_path]
+        # Errors only on stderr; progress, when wanted, is requested separately
+        cmd = [self.ffmpeg_path, '-nostats', '-loglevel', 'error']
+        cmd.extend(self._build_input_options(job))
+        cmd.extend(['-i', input_path])
+        cmd.extend(self._build_output_options(job))
+
+        # Overwrite output file
+        cmd.extend(['-y'])
+
+        # Output file
+        cmd.append(output_path)
+
+        return cmd
+
+    def _build_input_options(self, job: EncodeJob) -> list:
+        """Build the FFmpeg options that apply to one input file"""
+        backend = self._hw_backend(job)
+        if backend is None:
+            return []
+
+        # Decode on the GPU; keep the frames there when the whole pipeline can
+        hwaccel, gpu_scale = self.hw_decoders[backend]
+        cmd = ['-hwaccel', hwaccel]
+        if gpu_scale:
+            cmd.extend(['-hwaccel_output_format', hwaccel])
+        return cmd
+
+    def _build_output_options(self, job: EncodeJob) -> list:
+        """Build the FFmpeg options that apply to one output file"""
+        cmd = []
+        video_codec = job.video_codec
+        backend = self._hw_backend(job)
 
         # Add start time if specified
-        if options.get('start_time'):
-            cmd.extend(['-ss', options['start_time']])
+        if job.start_time:
+            cmd.extend(['-ss', job.start_time])
 
         # Add duration if specified
-        if options.get('duration'):
-            cmd.extend(['-t', options['duration']])
+        if job.duration:
+            cmd.extend(['-t', job.duration])
 
         # Video codec
-        video_codec = options.get('video_codec', 'h264')
-        codec_map = {
-            'h264': 'libx264',
-            'h265': 'libx265',
-            'vp9': 'libvpx-vp9',
-            'av1': 'libaom-av1'
-        }
-        cmd.extend(['-c:v', codec_map.get(video_codec, 'libx264')])
+        if backend:
+            cmd.extend(['-c:v', self.hw_codecs[backend][video_codec]])
+        else:
+            cmd.extend(['-c:v', _VIDEO_ENCODERS.get(video_codec, 'libx264')])
 
-        # Quality settings
-        quality = options.get('quality', 'medium')
+        # Quality settings; hardware encoders ignore -crf, so map it to their own scales
+        quality = job.quality
         if quality in self.quality_presets:
             preset_settings = self.quality_presets[quality]
-            if video_codec != 'av1':  # AV1 doesn't use CRF the same way
-                cmd.extend(['-crf', str(preset_settings['crf'])])
-            cmd.extend(['-preset', preset_settings['preset']])
+            crf = preset_settings['crf']
+            if backend == 'nvenc':
+                # NVENC has no CRF; constant-quality VBR is the closest match
+                if quality == 'lossless':
+                    cmd.extend(['-tune', 'lossless'])
+                else:
+                    cmd.extend(['-rc', 'vbr', '-cq', str(crf)])
+                    if not job.bitrate:
+                        cmd.extend(['-b:v', '0'])  # Don't cap quality at the default bitrate
+                cmd.extend(['-preset', self.nvenc_presets[preset_settings['preset']]])
+            elif backend == 'qsv':
+                cmd.extend(['-global_quality', str(max(1, crf)), '-preset', preset_settings['preset']])
+            elif backend == 'vaapi':
+                cmd.extend(['-qp', str(crf)])
+            elif backend == 'videotoolbox':
+                # Constant quality on a 1-100 scale, higher is better
+                cmd.extend(['-q:v', str(max(1, 100 - 2 * crf))])
+            else:
+                # Two-pass encodes aim at the bitrate alone; a CRF would fight it
+                two_pass = job.two_pass and job.bitrate
+                if video_codec != 'av1' and not two_pass:  # AV1 doesn't use CRF the same way
+                    cmd.extend(['-crf', str(crf)])
+                cmd.extend(['-preset', preset_settings['preset']])
 
         # Bitrate (overrides CRF if specified)
-        if options.get('bitrate'):
-            cmd.extend(['-b:v', options['bitrate']])
+        if job.bitrate:
+            cmd.extend(['-b:v', job.bitrate])
 
         # Resolution
-        if options.get('resolution'):
-            width, height = self._parse_resolution(options['resolution'])
-            cmd.extend(['-vf', f'scale={width}:{height}'])
+        if job.resolution:
+            width, height = self._parse_resolution(job.resolution)
+            # GPU scalers keep the decoded frames in GPU memory
+            scale_filter = (self.hw_decoders[backend][1] if backend else None) or 'scale'
+            cmd.extend(['-vf', f'{scale_filter}={width}:{height}'])
 
         # Frame rate
-        if options.get('fps'):
-            cmd.extend(['-r', str(options['fps'])])
+        if job.fps:
+            cmd.extend(['-r', str(job.fps)])
 
         # Audio codec
-        audio_codec = options.get('audio_codec', 'aac')
+        audio_codec = job.audio_codec
         if audio_codec == 'none':
             cmd.extend(['-an'])  # No audio
         else:
-            codec_map = {
-                'aac': 'aac',
-                'mp3': 'libmp3lame',
-                'opus': 'libopus'
-            }
-            cmd.extend(['-c:a', codec_map.get(audio_codec, 'aac')])
+            cmd.extend(['-c:a', self.audio_codecs.get(audio_codec, 'aac')])
 
         # Preset for encoding speed
-        preset = options.get('preset', 'medium')
-        if video_codec in ['h264', 'h265']:
+        preset = job.preset
+        if backend == 'nvenc':
+            cmd.extend(['-preset', self.nvenc_presets.get(preset, 'p4')])
+        elif backend == 'qsv' or (backend is None and video_codec in ['h264', 'h265']):
             cmd.extend(['-preset', preset])
 
+        # Thread count for this output's encoder
+        if job.threads:
+            cmd.extend(['-threads', str(job.threads)])
+
         # Output format
-        output_format = options.get('format', 'mp4')
-        if output_format == 'mp4':
+        if job.format == 'mp4':
             cmd.extend(['-movflags', '+faststart'])  # Optimize for streaming
 
-        # Overwrite output file
-        cmd.extend(['-y'])
+        return cmd
 
-        # Output file
-        cmd.append(output_path)
+    def convert_async(self, input_path: str, output_path: str, **options) -> Future:
+        """
+        Start converting a video and return without waiting for it
 
-        return cmd
+        Conversions run on a thread pool owned by this converter (a quarter
+        of the CPU cores wide); each thread only waits on its FFmpeg process,
+        so callers can queue several files, or probe the next file while the
+        current one encodes. Per-file progress output is off unless
+        progress=True is passed.
+
+        Args:
+            input_path: Path to input video file
+            output_path: Path to output video file
+            **options: Conversion options (same as convert)
+
+        Returns:
+            Future resolving to True if successful, False otherwise
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=max(1, (os.cpu_count() or 1) // 4),
+                                                    thread_name_prefix='video-convert')
+        options.setdefault('progress', False)
+        return self._executor.submit(self.convert, input_path, output_path, **options)
+
+    def shutdown(self, wait: bool = True):
+        """Stop the convert_async thread pool, optionally waiting for queued conversions"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
 
     def convert(self, input_path: str, output_path: str, **options) -> bool:
         """
@@ -163,9 +514,15 @@ class VideoConverter:
         Returns:
             bool: True if successful, False otherwise
         """
+        job = _encode_job(options)
         if not self._check_dependencies():
             return False
 
+        error = self._validate(job)
+        if error:
+            print(f"Error: {error}")
+            return False
+
         if not Path(input_path).exists():
             print(f"Error: Input file '{input_path}' not found")
             return False
@@ -174,33 +531,37 @@ class VideoConverter:
             # Create output directory if it doesn't exist
             Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
+            # Two-pass: analyse the input first (or reuse stats from an earlier encode)
+            pass_options = []
+            if job.two_pass:
+                pass_options = self._first_pass(input_path, job)
+                if pass_options is None:
+                    return False
+                if not pass_options:
+                    job = dataclasses.replace(job, two_pass=False)  # One pass after all, so keep the CRF
+
             # Build and execute FFmpeg command
-            cmd = self._build_ffmpeg_command(input_path, output_path, **options)
+            cmd = self._build_ffmpeg_command(input_path, output_path, job)
+            cmd[-2:-2] = pass_options
 
-            print(f"Executing: {' '.join(cmd[:3])} ... {' '.join(cmd[-10:])}")
+            # Run with progress if possible; -progress writes key=value lines to stdout
+            show_progress = job.progress
+            if show_progress:
+                cmd[1:1] = ['-progress', 'pipe:1']
 
-            # Run with progress if possible
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Executing: %s", _format_command(cmd))
             process = subprocess.Popen(
                 cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True
+                stdout=subprocess.PIPE if show_progress else subprocess.DEVNULL,
+                stderr=subprocess.PIPE
             )
 
             # Monitor progress
-            while True:
-                output = process.stderr.readline()
-                if output == '' and process.poll() is not None:
-                    break
-                if output and 'time=' in output:
-                    # Extract and display progress
-                    for part in output.split():
-                        if part.startswith('time='):
-                            time_str = part.split('=')[1]
-                            print(f"\rProgress: {time_str}", end='', flush=True)
-
-            process.wait()
-            print()  # New line after progress
+            progress = _ProgressLine() if show_progress else None
+            stderr_output = self._wait_with_progress(process, progress)
+            if progress:
+                progress.finish()
 
             if process.returncode == 0:
                 # Verify output file was created and has size > 0
@@ -211,8 +572,7 @@ class VideoConverter:
                     print("Error: Output file was not created properly")
                     return False
             else:
-                stderr_output = process.stderr.read() if process.stderr else "Unknown error"
-                print(f"FFmpeg error: {stderr_output}")
+                print(f"FFmpeg error: {stderr_output or 'Unknown error'}")
                 return False
 
         except subprocess.CalledProcessError as e:
@@ -222,6 +582,488 @@ class VideoConverter:
             print(f"Unexpected error: {e}")
             return False
 
+    def _pass_options(self, video_codec: str, pass_number: int, passlog: str) -> list:
+        """Options that make an encoder run one pass of a two-pass encode"""
+        if video_codec == 'h265':
+            # libx265 ignores -pass; its stats file is set through x265-params
+            return ['-x265-params', f'pass={pass_number}:stats={passlog}.log']
+        return ['-pass', str(pass_number), '-passlogfile', passlog]
+
+    def _passlog_key(self, input_path: str, job: EncodeJob) -> str:
+        """
+        Stats file name for the first pass of this input and these settings
+
+        The first pass only depends on the input and on the options that
+        change which frames the encoder sees, not on the target bitrate, so
+        encodes of one input at several bitrates share a single analysis.
+        """
+        st = os.stat(input_path)
+        key = (os.path.realpath(input_path), st.st_size, st.st_mtime_ns,
+               job.video_codec, job.resolution, job.fps, job.start_time, job.duration, job.preset)
+        return hashlib.sha1(repr(key).encode()).hexdigest()
+
+    def _passlog_dir(self) -> Path:
+        """Directory holding cached first-pass stats"""
+        cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(Path.home(), '.cache')
+        cache_dir = Path(cache_home) / 'media_converter' / 'passlog'
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        return cache_dir
+
+    def _prune_passlogs(self, cache_dir: Path):
+        """Delete first-pass stats, and leftovers of interrupted passes, unused for a week"""
+        cutoff = time.time() - _PASSLOG_MAX_AGE
+        for path in cache_dir.iterdir():
+            try:
+                if path.stat().st_mtime >= cutoff:
+                    continue
+                if path.suffix == '.done':
+                    # Marker first, so a half-deleted entry is never reused
+                    path.unlink()
+                    for stats in cache_dir.glob(path.stem + '*'):
+                        stats.unlink(missing_ok=True)
+                elif '.part-' in path.name:
+                    path.unlink()
+            except OSError:
+                pass
+
+    def _first_pass(self, input_path: str, job: EncodeJob) -> Optional[list]:
+        """
+        Run the analysis pass of a two-pass encode, unless its stats are already cached
+
+        Args:
+            input_path: Path to input video file
+            job: Encode settings
+
+        Returns:
+            Options for the second pass ([] to encode in one pass), or None if the first pass failed
+        """
+        video_codec = job.video_codec
+        if not job.bitrate:
+            print("Warning: two-pass encoding needs a bitrate, encoding in one pass")
+            return []
+        if self._hw_backend(job) is not None:
+            print("Warning: two-pass encoding is CPU-only, encoding in one pass")
+            return []
+
+        cache_dir = self._passlog_dir()
+        passlog = str(cache_dir / self._passlog_key(input_path, job))
+        marker = Path(passlog + '.done')
+        with self._probe_lock:
+            lock = self._passlog_locks.setdefault(passlog, threading.Lock())
+
+        with lock:
+            # Only a pass that finished leaves the marker; its mtime records the last use
+            if marker.exists():
+                marker.touch()
+                logger.info("Reusing first-pass stats for %s", input_path)
+            else:
+                self._prune_passlogs(cache_dir)
+                if not self._run_first_pass(input_path, job, passlog):
+                    return None
+                marker.touch()
+
+        return self._pass_options(video_codec, 2, passlog)
+
+    def _run_first_pass(self, input_path: str, job: EncodeJob, passlog: str) -> bool:
+        """Run FFmpeg's analysis pass, leaving its stats at the passlog prefix only if it succeeds"""
+        # Write under a private prefix and move the files into place afterwards, so an
+        # interrupted pass (or another process analysing the same input) can't leave
+        # partial stats behind under the shared name
+        partial = Path(f"{passlog}.part-{os.getpid()}")
+
+        # Audio and muxing don't affect the stats, so skip both
+        first_pass = dataclasses.replace(job, audio_codec='none', format=None)
+        cmd = [self.ffmpeg_path, '-nostats', '-loglevel', 'error']
+        cmd.extend(self._build_input_options(first_pass))
+        cmd.extend(['-i', input_path])
+        cmd.extend(self._build_output_options(first_pass))
+        cmd.extend(self._pass_options(job.video_codec, 1, str(partial)))
+        cmd.extend(['-f', 'null', '-y', os.devnull])
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Executing: %s", _format_command(cmd))
+        try:
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            if result.returncode != 0:
+                stderr = result.stderr[-_STDERR_TAIL_BYTES:].decode(errors='replace').strip()
+                print(f"FFmpeg error: {stderr or 'Unknown error'}")
+                return False
+
+            # libx264/libvpx write <prefix>-0.log(.mbtree), libx265 <prefix>.log(.cutree)
+            for path in partial.parent.glob(partial.name + '*'):
+                os.replace(path, passlog + path.name[len(partial.name):])
+            return True
+        finally:
+            for leftover in partial.parent.glob(partial.name + '*'):
+                leftover.unlink(missing_ok=True)
+
+    def _wait_with_progress(self, process: subprocess.Popen,
+                            progress: Optional[_ProgressLine] = None) -> str:
+        """
+        Wait for FFmpeg to exit while showing its progress
+
+        Progress comes from `-progress pipe:1` as key=value lines on stdout
+        (when stdout is piped); stderr only carries errors. Where the OS
+        supports pidfds (Linux 5.3+), the driver sleeps in one select() on
+        both pipes and the process itself, so it only wakes for new output
+        or the exit. Elsewhere it reads the progress lines one at a time
+        while a thread drains stderr.
+
+        Args:
+            process: Running FFmpeg process with stderr (and optionally stdout) piped
+            progress: Where to show progress (required when stdout is piped)
+
+        Returns:
+            The tail of FFmpeg's stderr, for error reporting
+        """
+        if not hasattr(os, 'pidfd_open'):
+            return self._wait_with_readline(process, progress)
+        try:
+            pidfd = os.pidfd_open(process.pid)
+        except OSError:
+            return self._wait_with_readline(process, progress)
+
+        progress_fd = process.stdout.fileno() if process.stdout else None
+        stderr_fd = process.stderr.fileno()
+        tail = bytearray()
+
+        with selectors.DefaultSelector() as selector:
+            for fd in (progress_fd, stderr_fd):
+                if fd is not None:
+                    os.set_blocking(fd, False)
+                    selector.register(fd, selectors.EVENT_READ)
+            selector.register(pidfd, selectors.EVENT_READ)
+            open_pipes = len(selector.get_map()) - 1
+            exited = False
+
+            # After the exit, keep reading until the pipes are drained
+            while open_pipes:
+                events = selector.select(timeout=0 if exited else 1.0)
+                if exited and not events:
+                    break
+
+                for key, _ in events:
+                    if key.fd == pidfd:
+                        exited = True
+                        selector.unregister(pidfd)
+                        continue
+
+                    try:
+                        data = os.read(key.fd, 65536)
+                    except BlockingIOError:
+                        continue
+                    if not data:
+                        selector.unregister(key.fd)
+                        open_pipes -= 1
+                    elif key.fd == stderr_fd:
+                        tail += data
+                        del tail[:-_STDERR_TAIL_BYTES]
+                    else:
+                        # Only the newest complete timestamp in the chunk matters; a read
+                        # can end mid-line, so look no further than the last newline
+                        end = data.rfind(b'\n')
+                        start = data.rfind(b'out_time=', 0, end) if end != -1 else -1
+                        if start != -1:
+                            progress.update(data[start + 9:data.index(b'\n', start)])
+
+        os.close(pidfd)
+        process.wait()
+        return tail.decode('utf-8', 'replace')
+
+    def _wait_with_readline(self, process: subprocess.Popen,
+                            progress: Optional[_ProgressLine] = None) -> str:
+        """Wait for FFmpeg to exit, reading progress line by line"""
+        # A corrupt input can log an error per frame; if nothing read stderr while we block
+        # on stdout, the pipe would fill (4 KB on Windows) and stall FFmpeg mid-write
+        stderr_lines = deque(maxlen=_STDERR_TAIL_LINES)
+        drain = threading.Thread(target=stderr_lines.extend, args=(process.stderr,), daemon=True)
+        drain.start()
+
+        if process.stdout:
+            for line in iter(process.stdout.readline, b''):
+                key, _, value = line.partition(b'=')
+                if key == b'out_time':
+                    progress.update(value.strip())
+
+        process.wait()
+        drain.join()
+        return b''.join(stderr_lines)[-_STDERR_TAIL_BYTES:].decode('utf-8', 'replace')
+
+    def convert_batch(self, input_paths: List[str], output_paths: List[str], **options) -> Dict[str, bool]:
+        """
+        Convert several videos with the same options in a single FFmpeg process
+
+        Every input gets its own -i and every output its own -map, which
+        saves one FFmpeg startup (codec init, probing, thread pools) per file.
+        If the combined run fails, outputs that don't cover their whole
+        input are redone one at a time, so a single bad input doesn't fail
+        the rest. Two-pass encodes need one
+        analysis per input, so they are converted one file at a time.
+
+        Args:
+            input_paths: Paths to input video files
+            output_paths: Output path for each input, in the same order
+            **options: Conversion options (same as convert)
+
+        Returns:
+            Dict mapping input files to success status
+        """
+        if len(input_paths) != len(output_paths):
+            raise ValueError("Need exactly one output path per input")
+
+        job = _encode_job(options)
+        results = {input_path: False for input_path in input_paths}
+        if not self._check_dependencies():
+            return results
+
+        error = self._validate(job)
+        if error:
+            print(f"Error: {error}")
+            return results
+
+        jobs = []
+        for input_path, output_path in zip(input_paths, output_paths):
+            if Path(input_path).exists():
+                jobs.append((input_path, output_path))
+            else:
+                print(f"Error: Input file '{input_path}' not found")
+        if not jobs:
+            return results
+
+        if job.two_pass:
+            for input_path, output_path in jobs:
+                results[input_path] = self.convert(input_path, output_path, **options)
+            return results
+
+        cmd = [self.ffmpeg_path, '-nostats', '-loglevel', 'error', '-y']
+        input_options = self._build_input_options(job)
+        for input_path, _ in jobs:
+            cmd.extend(input_options)
+            cmd.extend(['-i', input_path])
+
+        output_options = self._build_output_options(job)
+        keep_audio = job.audio_codec != 'none'
+        for index, (_, output_path) in enumerate(jobs):
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            # Any output present after a failed run was then written by that run
+            Path(output_path).unlink(missing_ok=True)
+            cmd.extend(['-map', f'{index}:v:0'])
+            if keep_audio:
+                cmd.extend(['-map', f'{index}:a:0?'])  # '?' tolerates silent inputs
+            cmd.extend(output_options)
+            cmd.append(output_path)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Executing: %s (%d inputs in one process)", _format_command(cmd), len(jobs))
+
+        try:
+            process = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                     universal_newlines=True)
+        except OSError as e:
+            print(f"Unexpected error: {e}")
+            return results
+
+        if process.returncode == 0:
+            for input_path, output_path in jobs:
+                output_file = Path(output_path)
+                results[input_path] = output_file.exists() and output_file.stat().st_size > 0
+            return results
+
+        # Outputs FFmpeg finished despite the error are kept; only the rest are redone
+        retry = [(input_path, output_path) for input_path, output_path in jobs
+                 if not self._output_complete(input_path, output_path, job)]
+        print(f"FFmpeg batch error, converting {len(retry)} of {len(jobs)} files one at a time: "
+              f"{process.stderr.strip()[-500:]}")
+        for input_path, _ in jobs:
+            results[input_path] = True
+        for input_path, output_path in retry:
+            results[input_path] = self.convert(input_path, output_path, **options)
+        return results
+
+    def _output_complete(self, input_path: str, output_path: str, job: EncodeJob) -> bool:
+        """Whether output_path holds all of input_path"""
+        try:
+            if os.path.getsize(output_path) == 0:
+                return False
+        except OSError:
+            return False
+
+        # Without ffprobe, or for a clip whose expected length isn't the input's, assume the worst
+        if not self.ffprobe_path or job.start_time or job.duration:
+            return False
+        try:
+            expected = float(self.get_video_info(input_path)['format']['duration'])
+            actual = float(self.get_video_info(output_path)['format']['duration'])
+        except (TypeError, KeyError, ValueError):
+            return False
+        return actual >= expected - 0.5
+
+    def concat(self, input_paths: List[str], output_path: str, **options) -> bool:
+        """
+        Join several videos into one output with a single FFmpeg process
+
+        The file list is fed to FFmpeg's concat demuxer on stdin, so no
+        manifest file is written and every input is decoded by the same
+        process. Inputs should share codec parameters and resolution.
+
+        Args:
+            input_paths: Paths to input video files, in playback order
+            output_path: Path to the joined output file
+            **options: Conversion options (same as convert)
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        job = _encode_job(options)
+        if not self._check_dependencies():
+            return False
+
+        error = self._validate(job)
+        if error:
+            print(f"Error: {error}")
+            return False
+
+        for input_path in input_paths:
+            if not Path(input_path).exists():
+                print(f"Error: Input file '{input_path}' not found")
+                return False
+
+        # The joined stream has no single input to analyse, so encode it in one pass
+        if job.two_pass:
+            print("Warning: two-pass encoding is not supported when joining, encoding in one pass")
+            job = dataclasses.replace(job, two_pass=False)
+
+        cmd = [self.ffmpeg_path, '-nostats', '-loglevel', 'error', '-y']
+        cmd.extend(self._build_input_options(job))
+        cmd.extend(_CONCAT_INPUT)
+        cmd.extend(self._build_output_options(job))
+        cmd.append(output_path)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Executing: %s (%d inputs via concat demuxer)", _format_command(cmd), len(input_paths))
+
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        return self._run_to_file(cmd, output_path, stdin_text=_concat_manifest(input_paths))
+
+    def _run_to_file(self, cmd: List[str], output_path: str, stdin_text: Optional[str] = None) -> bool:
+        """Run an FFmpeg command to completion and check that it wrote output_path"""
+        try:
+            process = subprocess.run(cmd, input=stdin_text, stdout=subprocess.DEVNULL,
+                                     stderr=subprocess.PIPE, universal_newlines=True)
+        except OSError as e:
+            print(f"Unexpected error: {e}")
+            return False
+
+        if process.returncode != 0:
+            print(f"FFmpeg error: {process.stderr.strip()[-500:]}")
+            return False
+
+        output_file = Path(output_path)
+        if output_file.exists() and output_file.stat().st_size > 0:
+            return True
+        print("Error: Output file was not created properly")
+        return False
+
+    def convert_chunked(self, input_path: str, output_path: str,
+                        chunks: Optional[int] = None, **options) -> bool:
+        """
+        Convert one long video by encoding pieces of it in parallel
+
+        A single encoder stops scaling at around 8 threads, so on large
+        machines the input is cut at keyframes into chunks (stream copy, no
+        decoding), the chunks' video is encoded concurrently, and the
+        results are joined without re-encoding. Audio is encoded once from
+        the original, so chunk boundaries don't introduce audio gaps.
+        Lossless, two-pass and clipped (start/duration) conversions use
+        convert().
+
+        Args:
+            input_path: Path to input video file
+            output_path: Path to output video file
+            chunks: Number of chunks (default: one per 8 CPU cores)
+            **options: Conversion options (same as convert)
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        job = _encode_job(options)
+        if not self._check_dependencies():
+            return False
+
+        error = self._validate(job)
+        if error:
+            print(f"Error: {error}")
+            return False
+
+        if not Path(input_path).exists():
+            print(f"Error: Input file '{input_path}' not found")
+            return False
+
+        cpu_count = os.cpu_count() or 1
+        if chunks is None:
+            chunks = cpu_count // 8
+
+        info = self.get_video_info(input_path) if self.ffprobe_path else None
+        try:
+            duration = float(info['format']['duration'])
+        except (TypeError, KeyError, ValueError):
+            duration = 0.0
+
+        if (chunks < 2 or duration <= 0 or job.quality == 'lossless' or job.two_pass
+                or job.start_time or job.duration):
+            return self.convert(input_path, output_path, **options)
+
+        output_format = job.format
+        output_dir = Path(output_path).parent
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        # Keep the temporary chunks on the output's filesystem, not in a small /tmp
+        with tempfile.TemporaryDirectory(prefix='.chunks-', dir=output_dir) as work_dir:
+            # 1. Split: the segment muxer cuts at the first keyframe after each time
+            split_times = ','.join(f"{duration * i / chunks:.3f}" for i in range(1, chunks))
+            source_ext = Path(input_path).suffix or '.mkv'
+            segment_pattern = os.path.join(work_dir, f'source%03d{source_ext}')
+            cmd = [self.ffmpeg_path, '-nostats', '-loglevel', 'error', '-y',
+                   '-i', input_path, '-map', '0:v:0', '-an', '-c', 'copy',
+                   '-f', 'segment', '-segment_times', split_times, '-reset_timestamps', '1',
+                   segment_pattern]
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Executing: %s", _format_command(cmd))
+            if subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode != 0:
+                print("Warning: Could not split the input, converting it in one piece")
+                return self.convert(input_path, output_path, **options)
+
+            segments = sorted(str(p) for p in Path(work_dir).glob(f'source*{source_ext}'))
+            encoded = [os.path.join(work_dir, f'encoded{i:03d}.{output_format}') for i in range(len(segments))]
+
+            # 2. Encode the chunks' video side by side, splitting the cores between them
+            chunk_options = dict(options, audio_codec='none', progress=False)
+            chunk_options.setdefault('threads', max(1, cpu_count // len(segments)))
+            print(f"Encoding {len(segments)} chunks in parallel")
+            with ThreadPoolExecutor(max_workers=len(segments)) as pool:
+                futures = [pool.submit(self.convert, segment, encoded_path, **chunk_options)
+                           for segment, encoded_path in zip(segments, encoded)]
+            if not all(future.result() for future in futures):
+                print("Error: Encoding a chunk failed")
+                return False
+
+            # 3. Join the encoded video and encode the original audio alongside it
+            cmd = [self.ffmpeg_path, '-nostats', '-loglevel', 'error', '-y']
+            cmd.extend(_CONCAT_INPUT)
+            cmd.extend(['-i', input_path, '-map', '0:v:0', '-c:v', 'copy'])
+            audio_codec = job.audio_codec
+            if audio_codec == 'none':
+                cmd.append('-an')
+            else:
+                cmd.extend(['-map', '1:a:0?', '-c:a', self.audio_codecs.get(audio_codec, 'aac')])
+            if output_format == 'mp4':
+                cmd.extend(['-movflags', '+faststart'])
+            cmd.append(output_path)
+
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Executing: %s", _format_command(cmd))
+            return self._run_to_file(cmd, output_path, stdin_text=_concat_manifest(encoded))
+
     def compress(self, input_path: str, output_path: str, quality: str = 'medium', **options) -> bool:
         """
         Compress video file
@@ -252,7 +1094,11 @@ class VideoConverter:
         Returns:
             bool: True if successful, False otherwise
         """
-        options['resolution'] = resolution
+        # Scaling to the size the video already has is a no-op, so skip the filter
+        video = self._first_stream(input_path, 'video')
+        source_size = (video.get('width'), video.get('height')) if video else None
+        if source_size is None or resolution.lower() != '{}x{}'.format(*source_size):
+            options['resolution'] = resolution
         return self.convert(input_path, output_path, **options)
 
     def extract_audio(self, input_path: str, output_path: str, audio_format: str = 'mp3') -> bool:
@@ -270,12 +1116,20 @@ class VideoConverter:
         if not self._check_dependencies():
             return False
 
+        # Audio already in the requested codec is copied out instead of re-encoded
+        audio = self._first_stream(input_path, 'audio')
+        if audio and audio.get('codec_name') == audio_format:
+            audio_codec = 'copy'
+        else:
+            audio_codec = 'libmp3lame' if audio_format == 'mp3' else audio_format
+
         try:
             cmd = [
                 self.ffmpeg_path,
+                '-nostats', '-loglevel', 'error',
                 '-i', input_path,
                 '-vn',  # No video
-                '-acodec', 'libmp3lame' if audio_format == 'mp3' else audio_format,
+                '-acodec', audio_codec,
                 '-y',
                 output_path
             ]
@@ -303,10 +1157,13 @@ class VideoConverter:
             return False
 
         try:
+            # Seeking before -i jumps to the nearest keyframe instead of decoding up to it
             cmd = [
                 self.ffmpeg_path,
-                '-i', input_path,
+                '-nostats', '-loglevel', 'error',
                 '-ss', timestamp,
+                '-noaccurate_seek',
+                '-i', input_path,
                 '-vframes', '1',
                 '-y',
                 output_path
@@ -323,33 +1180,58 @@ class VideoConverter:
         """Get list of supported output formats"""
         return ['mp4', 'avi', 'mkv', 'webm', 'mov', 'flv', 'm4v']
 
-    def batch_convert(self, input_files: list, output_dir: str, **options) -> Dict[str, bool]:
+    def batch_convert(self, input_files: list, output_dir: str,
+                      max_concurrent: Optional[int] = None, **options) -> Dict[str, bool]:
         """
         Batch convert multiple video files
 
+        Encodes run as separate FFmpeg processes, several at a time; x264/x265
+        stop scaling well past a handful of threads, so running a few encodes
+        side by side keeps more cores busy than running them one after another.
+
         Args:
             input_files: List of input file paths
             output_dir: Output directory
+            max_concurrent: Encodes to run at once (default: a quarter of the CPU cores)
             **options: Conversion options
 
         Returns:
-            Dict mapping input files to success status
+            Dict mapping input files to success status, in input order
         """
-        results = {}
+        results = {input_file: False for input_file in input_files}
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
 
+        # Build the job list first, then run it through the pool
+        output_format = options.get('format', 'mp4')
+        jobs = []
         for input_file in input_files:
             input_path = Path(input_file)
             if not input_path.exists():
-                results[input_file] = False
                 continue
 
             # Generate output filename
-            output_format = options.get('format', 'mp4')
             output_file = output_path / f"{input_path.stem}.{output_format}"
-
-            print(f"\nProcessing: {input_path.name}")
-            results[input_file] = self.convert(str(input_path), str(output_file), **options)
+            jobs.append((input_file, str(input_path), str(output_file)))
+
+        cpu_count = os.cpu_count() or 1
+        if max_concurrent is None:
+            max_concurrent = max(1, cpu_count // 4)
+        max_concurrent = max(1, min(max_concurrent, len(jobs) or 1))
+
+        # Split the cores between concurrent encodes unless the caller chose a count
+        if max_concurrent > 1:
+            options.setdefault('threads', max(1, cpu_count // max_concurrent))
+            options['progress'] = False  # Interleaved progress lines would be unreadable
+
+        with ThreadPoolExecutor(max_workers=max_concurrent) as pool:
+            # Threads are enough here: each one just waits on its FFmpeg process
+            futures = {}
+            for input_file, input_path, output_file in jobs:
+                print(f"\nProcessing: {Path(input_path).name}")
+                futures[pool.submit(self.convert, input_path, output_file, **options)] = input_file
+
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
 
         return results